@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from src.core.database import AsyncSessionFactory, engine
+from src.infrastructure.database.repositories.daily_stats_repository import DailyStatsRepository
+
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(user_id: int = None, start_date: date = None, end_date: date = None):
+    async with AsyncSessionFactory() as session:
+        daily_stats_repository = DailyStatsRepository(session)
+        await daily_stats_repository.rebuild(user_id, start_date, end_date)
+        await session.commit()
+    await engine.dispose()
+
+    if user_id is None:
+        logger.info("Rebuilt daily statistics for all users")
+    else:
+        logger.info("Rebuilt daily statistics for user %s", user_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild the user_daily_stats rollup from tasks and timer sessions"
+    )
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows")
+    parser.add_argument("--from", dest="start_date", type=date.fromisoformat, default=None,
+                        help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end_date", type=date.fromisoformat, default=None,
+                        help="Last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.start_date, args.end_date))
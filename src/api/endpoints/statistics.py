@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from ..api.dependencies import get_db_session_dependency, get_user_id_dependency
 from ..domain.services.stats_service import StatsService
-from ..domain.models.statistics import DailyStats, WeeklyStats, TagStats, ProductivityTrend
+from ..domain.models.statistics import DailyStats, WeeklyStats, TagStats, ProductivityTrend, RangeStats, ActivityHeatmap
 
 
 router = APIRouter(prefix="/stats", tags=["statistics"])
@@ -16,10 +16,7 @@ async def get_daily_stats(
     db_session: AsyncSession = Depends(get_db_session_dependency),
     user_id: int = Depends(get_user_id_dependency)
 ):
-    """Get statistics for a specific date"""
-    if not date:
-        date = datetime.now().strftime("%Y-%m-%d")
-    
+    """Get statistics for a specific date, today in the user's time zone by default"""
     stats_service = StatsService(db_session)
     return await stats_service.get_daily_stats(user_id, date)
 
@@ -34,6 +31,27 @@ async def get_weekly_stats(
     return await stats_service.get_weekly_stats(user_id)
 
 
+@router.get("/range", response_model=RangeStats)
+async def get_range_stats(
+    date_from: str = Query(..., alias="from", description="Start date (YYYY-MM-DD), inclusive"),
+    date_to: str = Query(..., alias="to", description="End date (YYYY-MM-DD), inclusive"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Get per-day, per-week or per-month statistics for an arbitrary date range"""
+    try:
+        start_date = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end_date = datetime.strptime(date_to, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    stats_service = StatsService(db_session)
+    return await stats_service.get_range_stats(user_id, start_date, end_date, granularity)
+
+
 @router.get("/tags", response_model=List[TagStats])
 async def get_tag_stats(
     tag_ids: str = None,  # Comma-separated list of tag IDs
@@ -56,10 +74,21 @@ async def get_tag_stats(
 
 @router.get("/trends", response_model=List[ProductivityTrend])
 async def get_productivity_trends(
-    days: int = 7,
+    days: int = Query(7, ge=1, le=366),
     db_session: AsyncSession = Depends(get_db_session_dependency),
     user_id: int = Depends(get_user_id_dependency)
 ):
     """Get productivity trends over the specified number of days"""
     stats_service = StatsService(db_session)
-    return await stats_service.get_productivity_trends(user_id, days)
\ No newline at end of file
+    return await stats_service.get_productivity_trends(user_id, days)
+
+
+@router.get("/heatmap", response_model=ActivityHeatmap)
+async def get_activity_heatmap(
+    days: int = Query(30, ge=1, le=366),
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Get a weekday x hour-of-day matrix of tracked seconds over the specified number of days"""
+    stats_service = StatsService(db_session)
+    return await stats_service.get_activity_heatmap(user_id, days)
\ No newline at end of file
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..api.dependencies import get_db_session_dependency, get_user_id_dependency
 from ..infrastructure.database.repositories.tag_repository import TagRepository
 from ..domain.models.task import TagCreate, TagUpdate, TagResponse
+from ..infrastructure.cache.stats_cache import stats_cache
 
 
 router = APIRouter(prefix="/tags", tags=["tags"])
@@ -23,6 +24,7 @@ async def create_tag(
         raise HTTPException(status_code=400, detail="Tag already exists for this user")
     
     created_tag = await tag_repository.create_tag_for_user(tag.name, user_id, tag.color)
+    stats_cache.invalidate_user(user_id)  # The new tag shows up in tag statistics
     return TagResponse.from_orm(created_tag)
 
 
@@ -4,7 +4,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from ..api.dependencies import get_db_session_dependency, get_user_id_dependency
 from ..domain.services.task_service import TaskService
-from ..domain.models.task import TaskCreate, TaskUpdate, TaskResponse, TagResponse
+from ..domain.models.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskDetailResponse, TaskPage, TaskSummaryPage, TagResponse,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkDeleteResponse
+)
 from ..infrastructure.database.models import Task, Tag, task_tags
 
 
@@ -22,34 +25,134 @@ async def create_task(
     return await task_service.create_task(task, user_id)
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+@router.post(":bulk", response_model=List[TaskResponse], status_code=status.HTTP_201_CREATED)
+async def create_tasks(
+    bulk_data: TaskBulkCreate,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Create many tasks in one request"""
+    task_service = TaskService(db_session)
+    return await task_service.create_tasks(bulk_data, user_id)
+
+
+@router.patch(":bulk", response_model=List[TaskResponse])
+async def update_tasks(
+    bulk_data: TaskBulkUpdate,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Update many tasks in one request, e.g. to complete them; all or nothing"""
+    task_service = TaskService(db_session)
+    result = await task_service.update_tasks(bulk_data, user_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Task not found or not accessible")
+    return result
+
+
+@router.delete(":bulk", response_model=TaskBulkDeleteResponse)
+async def delete_tasks(
+    bulk_data: TaskBulkDelete,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Delete many tasks in one request; all or nothing"""
+    task_service = TaskService(db_session)
+    result = await task_service.delete_tasks(bulk_data, user_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Task not found or not accessible")
+    return result
+
+
+@router.get("/compact", response_model=TaskSummaryPage)
+async def get_task_summaries(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    completed: Optional[bool] = None,
+    priority: Optional[int] = None,
+    min_priority: Optional[int] = Query(None, description="Only tasks with at least this priority"),
+    tag_ids: str = Query(None, description="Comma-separated list of tag IDs to filter by"),
+    tag_mode: str = Query("any", pattern="^(any|all)$", description="Match tasks with any or all of tag_ids"),
+    title_contains: str = Query(None, description="Filter tasks by title containing this text"),
+    estimated_time_min: Optional[int] = None,
+    estimated_time_max: Optional[int] = None,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """
+    Same listing and filters as GET /tasks/, but each task is only its id, title,
+    priority, completed flag and tag names, selected as plain columns
+    """
+    tag_id_list = []
+    if tag_ids:
+        try:
+            tag_id_list = [int(tid.strip()) for tid in tag_ids.split(',')]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid tag IDs format")
+
+    task_service = TaskService(db_session)
+    try:
+        page = await task_service.get_task_summaries(
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+            completed=completed,
+            priority=priority,
+            min_priority=min_priority,
+            tag_id_list=tag_id_list,
+            tag_mode=tag_mode,
+            title_contains=title_contains,
+            estimated_time_min=estimated_time_min,
+            estimated_time_max=estimated_time_max,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return page
+
+
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks(
+    q: str = Query(..., min_length=1, description="Words to look for in task titles and descriptions"),
+    limit: int = Query(20, ge=1, le=100),
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Search the user's tasks, best match first. Declared before /{task_id} so it is not taken for an ID"""
+    task_service = TaskService(db_session)
+    return await task_service.search_tasks(user_id, q, limit)
+
+
+@router.get("/{task_id}", response_model=TaskDetailResponse)
 async def get_task(
     task_id: int,
+    recent_sessions: int = Query(0, ge=0, le=50, description="Number of latest finished timer sessions to include"),
     db_session: AsyncSession = Depends(get_db_session_dependency),
     user_id: int = Depends(get_user_id_dependency)
 ):
-    """Get a specific task by ID"""
+    """Get a specific task by ID, with its number of timer sessions and optionally the latest ones"""
     task_service = TaskService(db_session)
-    result = await task_service.get_task(task_id, user_id)
+    result = await task_service.get_task(task_id, user_id, recent_sessions)
     if not result:
         raise HTTPException(status_code=404, detail="Task not found")
     return result
 
 
-@router.get("/", response_model=List[TaskResponse])
+@router.get("/", response_model=TaskPage)
 async def get_tasks(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     completed: Optional[bool] = None,
     priority: Optional[int] = None,
+    min_priority: Optional[int] = Query(None, description="Only tasks with at least this priority"),
     tag_ids: str = Query(None, description="Comma-separated list of tag IDs to filter by"),
+    tag_mode: str = Query("any", pattern="^(any|all)$", description="Match tasks with any or all of tag_ids"),
     title_contains: str = Query(None, description="Filter tasks by title containing this text"),
     estimated_time_min: Optional[int] = None,
     estimated_time_max: Optional[int] = None,
     db_session: AsyncSession = Depends(get_db_session_dependency),
     user_id: int = Depends(get_user_id_dependency)
 ):
-    """Get all tasks for a user with optional filtering"""
+    """Get a page of the user's tasks, newest first, with optional filtering"""
     tag_id_list = []
     if tag_ids:
         try:
@@ -58,18 +161,23 @@ async def get_tasks(
             raise HTTPException(status_code=400, detail="Invalid tag IDs format")
 
     task_service = TaskService(db_session)
-    tasks = await task_service.get_tasks(
-        user_id=user_id,
-        skip=skip,
-        limit=limit,
-        completed=completed,
-        priority=priority,
-        tag_id_list=tag_id_list,
-        title_contains=title_contains,
-        estimated_time_min=estimated_time_min,
-        estimated_time_max=estimated_time_max,
-    )
-    return tasks
+    try:
+        page = await task_service.get_tasks(
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+            completed=completed,
+            priority=priority,
+            min_priority=min_priority,
+            tag_id_list=tag_id_list,
+            tag_mode=tag_mode,
+            title_contains=title_contains,
+            estimated_time_min=estimated_time_min,
+            estimated_time_max=estimated_time_max,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return page
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
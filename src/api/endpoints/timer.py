@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from ..api.dependencies import get_db_session_dependency, get_user_id_dependency
 from ..domain.services.timer_service import TimerService
-from ..domain.models.timer import TimerStart, TimerStop, TimerResponse
+from ..domain.models.task import UserResponse
+from ..domain.models.timer import (
+    TimerStart, TimerStop, TimerPause, TimerResume, TimerResponse,
+    TimerSessionBulkImport, TimerSessionBulkImportResponse
+)
 
 
 router = APIRouter(prefix="/timer", tags=["timer"])
@@ -16,7 +22,10 @@ async def start_timer(
 ):
     """Start a timer for a task"""
     timer_service = TimerService(db_session)
-    result = await timer_service.start_timer(timer_data, user_id)
+    try:
+        result = await timer_service.start_timer(timer_data, user_id)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Another timer was started at the same time, please retry")
     if not result:
         raise HTTPException(status_code=404, detail="Task not found or not accessible")
     return result
@@ -36,6 +45,68 @@ async def stop_timer(
     return result
 
 
+@router.post("/pause", response_model=TimerResponse)
+async def pause_timer(
+    timer_data: TimerPause,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Pause a running timer"""
+    timer_service = TimerService(db_session)
+    result = await timer_service.pause_timer(timer_data.timer_id, user_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="No running timer session found")
+    return result
+
+
+@router.post("/resume", response_model=TimerResponse)
+async def resume_timer(
+    timer_data: TimerResume,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Resume a paused timer"""
+    timer_service = TimerService(db_session)
+    result = await timer_service.resume_timer(timer_data.timer_id, user_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="No paused timer session found")
+    return result
+
+
+@router.post("/sessions:bulk", response_model=TimerSessionBulkImportResponse, status_code=status.HTTP_201_CREATED)
+async def import_timer_sessions(
+    import_data: TimerSessionBulkImport,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Import finished timer sessions in bulk, e.g. from an offline client or another tracker"""
+    timer_service = TimerService(db_session)
+    result = await timer_service.import_sessions(import_data, user_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Task not found or not accessible")
+    return result
+
+
+@router.get("/auto-closed/users", response_model=List[UserResponse])
+async def get_users_with_auto_closed_timers(
+    limit: int = Query(100, ge=1, le=1000),
+    db_session: AsyncSession = Depends(get_db_session_dependency)
+):
+    """Users with timers closed by the abandoned timer sweep that were not reported yet"""
+    timer_service = TimerService(db_session)
+    return await timer_service.get_users_with_auto_closed_timers(limit)
+
+
+@router.post("/auto-closed:report", response_model=List[TimerResponse])
+async def report_auto_closed_timers(
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Return the timers closed by the abandoned timer sweep that were not reported yet, and mark them reported"""
+    timer_service = TimerService(db_session)
+    return await timer_service.report_auto_closed_timers(user_id)
+
+
 @router.get("/active", response_model=TimerResponse)
 async def get_active_timer(
     db_session: AsyncSession = Depends(get_db_session_dependency),
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..schemas.user import UserCreate, UserResponse
+from ..schemas.user import UserCreate, UserUpdate, UserResponse
 from ..domain.services.user_service import UserService
-from ..api.dependencies import get_db_session_dependency
+from ..api.dependencies import get_db_session_dependency, get_user_id_dependency
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -20,9 +20,29 @@ async def get_or_create_user(
     user_service = UserService(db_session)
     user = await user_service.get_or_create_user(
         telegram_id=str(user_data.telegram_id),
-        username=user_data.username
+        username=user_data.username,
+        timezone=user_data.timezone
     )
     if not user:
         raise HTTPException(status_code=500, detail="Could not create or retrieve user.")
     
     return user
+
+
+@router.patch("/me", response_model=UserResponse)
+async def update_current_user(
+    user_data: UserUpdate,
+    db_session: AsyncSession = Depends(get_db_session_dependency),
+    user_id: int = Depends(get_user_id_dependency)
+):
+    """Update the current user's profile, e.g. their time zone"""
+    user_service = UserService(db_session)
+    user = await user_service.update_user(
+        user_id,
+        username=user_data.username,
+        timezone=user_data.timezone,
+        max_timer_duration=user_data.max_timer_duration
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
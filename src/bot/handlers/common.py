@@ -11,7 +11,7 @@ router = Router()
 
 @router.message(Command("search"))
 async def command_search(message: Message, state: FSMContext):
-    """Search for tasks with various filters"""
+    """Search task titles and descriptions on the server"""
     user_data = await state.get_data()
     user_id = user_data.get("user_id")
     if not user_id:
@@ -20,20 +20,18 @@ async def command_search(message: Message, state: FSMContext):
 
     command_parts = message.text.split(maxsplit=1)
     if len(command_parts) < 2:
-        await message.answer("Usage: /search <query> or /search filter:priority=high etc.")
+        await message.answer("Usage: /search <words>, e.g. /search report draft")
         return
     
-    # This is a stub and doesn't use the filters yet.
-    # It just demonstrates the auth flow.
     async with ApiClient(settings.api_base_url) as api_client:
         try:
-            tasks = await api_client.get_tasks(user_id=user_id)
+            tasks = await api_client.search_tasks(user_id=user_id, query=command_parts[1], limit=10)
             if not tasks:
                 await message.answer("No tasks found matching your criteria.")
                 return
             
-            tasks_text = "<b>Your Tasks (search not fully implemented):</b>\n\n"
-            for i, task in enumerate(tasks[:10], 1):
+            tasks_text = "<b>Search results:</b>\n\n"
+            for i, task in enumerate(tasks, 1):
                 status = "✅" if task.completed else "⏳"
                 tasks_text += f"{i}. {status} <b>{task.title}</b>\n"
             
@@ -81,17 +79,14 @@ async def show_high_priority_tasks(message: Message, state: FSMContext):
 
     async with ApiClient(settings.api_base_url) as api_client:
         try:
-            # The get_tasks endpoint doesn't support priority filtering yet,
-            # so we filter client-side.
-            tasks = await api_client.get_tasks(user_id=user_id)
-            high_prio_tasks = [task for task in tasks if task.priority >= 4]
-            
+            high_prio_tasks = (await api_client.get_task_summaries(user_id=user_id, min_priority=4, limit=10)).items
+
             if not high_prio_tasks:
                 await message.answer("No high priority tasks found.")
                 return
             
             tasks_text = "<b>High Priority Tasks:</b>\n\n"
-            for i, task in enumerate(high_prio_tasks[:10], 1):
+            for i, task in enumerate(high_prio_tasks, 1):
                 status = "✅" if task.completed else "⏳"
                 tasks_text += f"{i}. {status} <b>{task.title}</b> ({'⭐' * task.priority})\n"
             
@@ -1,6 +1,6 @@
 from aiogram import Router
 from aiogram.types import Message
-from aiogram.filters import CommandStart, Command
+from aiogram.filters import CommandStart, Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from ..keyboards.builders import get_main_keyboard
 from ..services.api_client import ApiClient
@@ -32,6 +32,7 @@ async def command_start(message: Message, state: FSMContext):
             "/start - Show this message\n"
             "/newtask - Create a new task\n"
             "/mytasks - List your tasks\n"
+            "/timezone - Set your time zone\n"
             "/help - Show help information\n\n"
             "Use the buttons below to navigate:"
         )
@@ -44,6 +45,29 @@ async def command_start(message: Message, state: FSMContext):
         )
 
 
+@router.message(Command("timezone"))
+async def command_timezone(message: Message, command: CommandObject, state: FSMContext):
+    """Set the time zone statistics are bucketed in, e.g. /timezone Europe/Berlin"""
+    user_data = await state.get_data()
+    user_id = user_data.get("user_id")
+
+    if not user_id:
+        await message.answer("Please run /start first to register.")
+        return
+
+    if not command.args:
+        await message.answer("Usage: /timezone Area/City, e.g. /timezone Europe/Berlin")
+        return
+
+    async with ApiClient(settings.api_base_url) as api_client:
+        user = await api_client.update_user(user_id=user_id, timezone=command.args.strip())
+
+    if user:
+        await message.answer(f"🌍 Time zone set to {user.timezone}.")
+    else:
+        await message.answer("❌ Unknown time zone. Use a name like Europe/Berlin or Asia/Tokyo.")
+
+
 @router.message(Command("help"))
 async def command_help(message: Message):
     """Handle /help command"""
@@ -59,13 +83,15 @@ async def command_help(message: Message):
         "⏱️ <b>Time Tracking:</b>\n"
         "• /starttimer - Begin timing a task\n"
         "• /stoptimer - Finish timing the current task\n"
+        "• /pausetimer, /resumetimer - Take a break without ending the session\n"
         "• /current - See what task you're currently working on\n\n"
         
         "📊 <b>Statistics:</b>\n"
         "• /stats - Get overall productivity statistics\n"
         "• /statstoday - View today's statistics\n"
         "• /statsweek - View weekly statistics\n"
-        "• /statstag - Get statistics filtered by tag\n\n"
+        "• /statstag - Get statistics filtered by tag\n"
+        "• /timezone - Set the time zone your days are counted in\n\n"
         
         "Use the menu buttons for quick access to common functions!"
     )
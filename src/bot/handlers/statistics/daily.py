@@ -8,6 +8,30 @@ from ...core.config import settings
 
 router = Router()
 
+WEEKDAYS = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
+HEATMAP_SHADES = " ░▒▓█"
+
+
+def format_heatmap(heatmap) -> str:
+    """Render the weekday x hour matrix as a block of shaded characters"""
+    busiest = max(max(row) for row in heatmap.seconds)
+    if busiest == 0:
+        return f"🔥 <b>Activity Heatmap</b>\n\nNo tracked time in the last {heatmap.days} days."
+
+    lines = ["   0     6     12    18   "]
+    for weekday, row in zip(WEEKDAYS, heatmap.seconds):
+        cells = ""
+        for seconds in row:
+            shade = 0 if seconds == 0 else 1 + (seconds * (len(HEATMAP_SHADES) - 2)) // busiest
+            cells += HEATMAP_SHADES[shade]
+        lines.append(f"{weekday} {cells}")
+
+    return (
+        f"🔥 <b>Activity Heatmap (last {heatmap.days} days)</b>\n\n"
+        f"<pre>{chr(10).join(lines)}</pre>\n"
+        f"Busiest hour: {round(busiest / 60)} min"
+    )
+
 
 @router.message(Command("stats"))
 async def command_stats(message: Message, state: FSMContext):
@@ -36,7 +60,7 @@ async def command_stats_today(message: Message, state: FSMContext):
                 return
             stats_text = (
                 f"📅 <b>Today's Statistics</b>\n\n"
-                f"⏱️ Time spent: {stats.total_time_spent} minutes\n"
+                f"⏱️ Time spent: {round(stats.total_time_spent / 60)} minutes\n"
                 f"✅ Completed tasks: {stats.completed_tasks}\n"
                 f"📝 Active tasks: {stats.active_tasks}"
             )
@@ -63,13 +87,13 @@ async def command_stats_week(message: Message, state: FSMContext):
 
             stats_text = (
                 f"📆 <b>Week's Statistics ({stats.week_start} to {stats.week_end})</b>\n\n"
-                f"⏱️ Total time spent: {stats.total_time_spent} minutes\n"
+                f"⏱️ Total time spent: {round(stats.total_time_spent / 60)} minutes\n"
                 f"✅ Completed tasks: {stats.completed_tasks}\n\n"
                 f"<b>Daily breakdown:</b>\n"
             )
             
             for day_stat in stats.daily_breakdown:
-                stats_text += f"  {day_stat.date}: {day_stat.total_time_spent} min, {day_stat.completed_tasks} tasks\n"
+                stats_text += f"  {day_stat.date}: {round(day_stat.total_time_spent / 60)} min, {day_stat.completed_tasks} tasks\n"
             
             await message.answer(stats_text, parse_mode="HTML")
         except Exception as e:
@@ -95,7 +119,7 @@ async def stats_callback(callback: CallbackQuery, state: FSMContext):
                 if stats:
                     stats_text = (
                         f"📅 <b>Today's Statistics</b>\n\n"
-                        f"⏱️ Time spent: {stats.total_time_spent} minutes\n"
+                        f"⏱️ Time spent: {round(stats.total_time_spent / 60)} minutes\n"
                         f"✅ Completed tasks: {stats.completed_tasks}\n"
                         f"📝 Active tasks: {stats.active_tasks}"
                     )
@@ -106,7 +130,7 @@ async def stats_callback(callback: CallbackQuery, state: FSMContext):
                 if stats:
                     stats_text = (
                         f"📆 <b>Week's Statistics ({stats.week_start} to {stats.week_end})</b>\n\n"
-                        f"⏱️ Total time spent: {stats.total_time_spent} minutes\n"
+                        f"⏱️ Total time spent: {round(stats.total_time_spent / 60)} minutes\n"
                         f"✅ Completed tasks: {stats.completed_tasks}"
                     )
                 else:
@@ -116,9 +140,15 @@ async def stats_callback(callback: CallbackQuery, state: FSMContext):
                 stats_text = "🏷️ <b>Statistics by Tags</b>\n\n"
                 if stats:
                     for tag_stat in stats:
-                        stats_text += f"  {tag_stat.tag_name}: {tag_stat.total_time_spent} min, {tag_stat.task_count} tasks\n"
+                        stats_text += f"  {tag_stat.tag_name}: {round(tag_stat.total_time_spent / 60)} min, {tag_stat.task_count} tasks\n"
                 else:
                     stats_text += "No tag statistics available."
+            elif stat_type == "heatmap":
+                heatmap = await api_client.get_activity_heatmap(user_id=user_id)
+                if heatmap:
+                    stats_text = format_heatmap(heatmap)
+                else:
+                    stats_text = "Could not retrieve activity heatmap."
             # Trends endpoint is not implemented yet in the API in this branch
             # elif stat_type == "trends":
             #     ...
@@ -3,7 +3,7 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from ..services.state import TaskEditing
-from ..keyboards.builders import get_task_actions_keyboard
+from ..keyboards.builders import get_task_actions_keyboard, get_more_tasks_keyboard
 from ..services.api_client import ApiClient
 from ...core.config import settings
 
@@ -11,6 +11,9 @@ from ...core.config import settings
 router = Router()
 
 
+TASKS_PAGE_SIZE = 5
+
+
 @router.message(Command("mytasks"))
 async def command_list_tasks(message: Message, state: FSMContext):
     """Show user's tasks with action options"""
@@ -21,19 +24,41 @@ async def command_list_tasks(message: Message, state: FSMContext):
         await message.answer("Please run /start first to register.")
         return
 
+    await send_tasks_page(message, state, user_id)
+
+
+@router.callback_query(F.data == "tasks_more")
+async def more_tasks_callback(callback: CallbackQuery, state: FSMContext):
+    """Show the next page of the user's tasks"""
+    user_data = await state.get_data()
+    user_id = user_data.get("user_id")
+    cursor = user_data.get("tasks_cursor")
+
+    if not user_id or not cursor:
+        await callback.answer("Nothing more to show.")
+        return
+
+    await callback.message.edit_reply_markup(reply_markup=None)
+    await send_tasks_page(callback.message, state, user_id, cursor)
+    await callback.answer()
+
+
+async def send_tasks_page(message: Message, state: FSMContext, user_id: int, cursor: str = None):
+    """Send one page of tasks; the next page's cursor is kept in the FSM state"""
     async with ApiClient(settings.api_base_url) as api_client:
         try:
-            tasks = await api_client.get_tasks(user_id=user_id)
-            if not tasks:
+            page = await api_client.get_tasks(user_id=user_id, limit=TASKS_PAGE_SIZE, cursor=cursor)
+            if not page.items and not cursor:
                 await message.answer("You don't have any tasks yet. Use /newtask to create one!")
                 return
-            
-            await message.answer("Here are your latest tasks:")
-            for i, task in enumerate(tasks[:5], 1):  # Show first 5 tasks
+
+            if not cursor:
+                await message.answer("Here are your latest tasks:")
+            for task in page.items:
                 status = "✅" if task.completed else "⏳"
                 task_info = (
-                    f"{i}. {status} <b>{task.title}</b>\n"
-                    f"   Est. time: {task.estimated_time} min\n"
+                    f"{status} <b>{task.title}</b>\n"
+                    f"   Est. time: {task.estimated_time} min | Actual: {round(task.actual_time_spent / 60)} min\n"
                     f"   Priority: {'⭐' * task.priority}\n"
                 )
                 
@@ -42,6 +67,10 @@ async def command_list_tasks(message: Message, state: FSMContext):
                     task_info += f"   Tags: {', '.join(tag_names)}\n"
                 
                 await message.answer(task_info, parse_mode="HTML", reply_markup=get_task_actions_keyboard(task.id))
+
+            await state.update_data(tasks_cursor=page.next_cursor)
+            if page.next_cursor:
+                await message.answer("There are more tasks.", reply_markup=get_more_tasks_keyboard())
         except Exception as e:
             await message.answer(f"❌ Failed to load tasks: {str(e)}")
 
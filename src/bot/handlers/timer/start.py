@@ -4,11 +4,21 @@ from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from ..services.api_client import ApiClient
 from ...core.config import settings
-from datetime import datetime
 
 router = Router()
 
 
+async def report_auto_closed_timers(message: Message, api_client: ApiClient, user_id: int):
+    """Tell the user about timers the server stopped because they ran past the time limit"""
+    for timer in await api_client.report_auto_closed_timers(user_id=user_id):
+        task = f"task ID {timer.task_id}" if timer.task_id is not None else "a deleted task"
+        minutes = round((timer.duration or 0) / 60)
+        await message.answer(
+            f"⏱️ Your timer for {task} was left running and was stopped automatically "
+            f"after {minutes} minutes."
+        )
+
+
 @router.message(Command("starttimer"))
 async def command_start_timer(message: Message, state: FSMContext):
     """Start timer for a task"""
@@ -31,6 +41,7 @@ async def command_start_timer(message: Message, state: FSMContext):
         return
     
     async with ApiClient(settings.api_base_url) as api_client:
+        await report_auto_closed_timers(message, api_client, user_id)
         try:
             timer_response = await api_client.start_timer(user_id=user_id, task_id=task_id)
             if timer_response:
@@ -52,6 +63,7 @@ async def command_stop_timer(message: Message, state: FSMContext):
         return
 
     async with ApiClient(settings.api_base_url) as api_client:
+        await report_auto_closed_timers(message, api_client, user_id)
         try:
             active_timer = await api_client.get_active_timer(user_id=user_id)
             if not active_timer:
@@ -60,12 +72,10 @@ async def command_stop_timer(message: Message, state: FSMContext):
             
             timer_response = await api_client.stop_timer(user_id=user_id, timer_id=active_timer.id)
             if timer_response:
-                # Assuming the API returns a duration, but the model doesn't have it.
-                # Let's calculate it manually for now if end_time is present.
+                # Duration excludes paused time
                 duration = "N/A"
-                if timer_response.end_time:
-                    duration_secs = (timer_response.end_time - timer_response.start_time).total_seconds()
-                    duration = f"{int(duration_secs // 60)} minutes"
+                if timer_response.duration is not None:
+                    duration = f"{round(timer_response.duration / 60)} minutes"
 
                 await message.answer(f"✅ Timer stopped! Duration: {duration}.")
             else:
@@ -74,6 +84,60 @@ async def command_stop_timer(message: Message, state: FSMContext):
             await message.answer(f"❌ Failed to stop timer: {str(e)}")
 
 
+@router.message(Command("pausetimer"))
+async def command_pause_timer(message: Message, state: FSMContext):
+    """Pause the current timer"""
+    user_data = await state.get_data()
+    user_id = user_data.get("user_id")
+
+    if not user_id:
+        await message.answer("Please run /start first to register.")
+        return
+
+    async with ApiClient(settings.api_base_url) as api_client:
+        await report_auto_closed_timers(message, api_client, user_id)
+        try:
+            active_timer = await api_client.get_active_timer(user_id=user_id)
+            if not active_timer:
+                await message.answer("❌ No active timer found.")
+                return
+
+            timer_response = await api_client.pause_timer(user_id=user_id, timer_id=active_timer.id)
+            if timer_response:
+                await message.answer("⏸️ Timer paused. Use /resumetimer to continue.")
+            else:
+                await message.answer("❌ Timer is already paused.")
+        except Exception as e:
+            await message.answer(f"❌ Failed to pause timer: {str(e)}")
+
+
+@router.message(Command("resumetimer"))
+async def command_resume_timer(message: Message, state: FSMContext):
+    """Resume the paused timer"""
+    user_data = await state.get_data()
+    user_id = user_data.get("user_id")
+
+    if not user_id:
+        await message.answer("Please run /start first to register.")
+        return
+
+    async with ApiClient(settings.api_base_url) as api_client:
+        await report_auto_closed_timers(message, api_client, user_id)
+        try:
+            active_timer = await api_client.get_active_timer(user_id=user_id)
+            if not active_timer:
+                await message.answer("❌ No active timer found.")
+                return
+
+            timer_response = await api_client.resume_timer(user_id=user_id, timer_id=active_timer.id)
+            if timer_response:
+                await message.answer("▶️ Timer resumed.")
+            else:
+                await message.answer("❌ Timer is not paused.")
+        except Exception as e:
+            await message.answer(f"❌ Failed to resume timer: {str(e)}")
+
+
 @router.message(Command("current"))
 async def command_current_task(message: Message, state: FSMContext):
     """Show the current task being worked on"""
@@ -85,6 +149,7 @@ async def command_current_task(message: Message, state: FSMContext):
         return
 
     async with ApiClient(settings.api_base_url) as api_client:
+        await report_auto_closed_timers(message, api_client, user_id)
         try:
             active_timer = await api_client.get_active_timer(user_id=user_id)
             if not active_timer:
@@ -95,11 +160,11 @@ async def command_current_task(message: Message, state: FSMContext):
             task = await api_client.get_task(user_id=user_id, task_id=active_timer.task_id)
             if task:
                 # Calculate elapsed time
-                start_time_naive = active_timer.start_time.replace(tzinfo=None)
-                elapsed_time = (datetime.utcnow() - start_time_naive).total_seconds() // 60
+                elapsed_time = active_timer.elapsed_seconds() // 60
+                status = " (paused)" if active_timer.paused else ""
 
                 await message.answer(
-                    f"⏱️ Currently working on:\n\n"
+                    f"⏱️ Currently working on{status}:\n\n"
                     f"<b>{task.title}</b>\n"
                     f"Elapsed time: {int(elapsed_time)} minutes\n"
                     f"Estimated time: {task.estimated_time} minutes",
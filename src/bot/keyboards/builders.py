@@ -30,6 +30,13 @@ def get_task_actions_keyboard(task_id: int):
     return builder.as_markup()
 
 
+def get_more_tasks_keyboard():
+    """Keyboard that loads the next page of the task list"""
+    builder = InlineKeyboardBuilder()
+    builder.button(text="➡️ More", callback_data="tasks_more")
+    return builder.as_markup()
+
+
 def get_priority_keyboard():
     """Inline keyboard for selecting task priority"""
     builder = InlineKeyboardBuilder()
@@ -71,5 +78,6 @@ def get_statistics_keyboard():
     builder.button(text="📆 Week", callback_data="stats_week")
     builder.button(text="🏷️ By Tags", callback_data="stats_by_tags")
     builder.button(text="📈 Trends", callback_data="stats_trends")
+    builder.button(text="🔥 Heatmap", callback_data="stats_heatmap")
     builder.adjust(2)
     return builder.as_markup()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class Tag(BaseModel):
@@ -16,18 +16,51 @@ class Task(BaseModel):
     estimated_time: int
     priority: int
     completed: bool
+    actual_time_spent: int = 0
     tags: List[Tag] = []
 
+class TaskPage(BaseModel):
+    items: List[Task] = []
+    next_cursor: Optional[str] = None
+
+class TaskSummary(BaseModel):
+    id: int
+    title: str
+    priority: int
+    completed: bool
+    tags: List[str] = []  # Tag names
+
+class TaskSummaryPage(BaseModel):
+    items: List[TaskSummary] = []
+    next_cursor: Optional[str] = None
+
 class Timer(BaseModel):
     id: int
-    task_id: int
+    task_id: Optional[int] = None
     start_time: datetime
+    end_time: Optional[datetime] = None
+    duration: Optional[int] = None
     active: bool
+    paused: bool = False
+    segments: List[int] = [0]
+    elapsed: int = 0
+    auto_closed: bool = False
+
+    def elapsed_seconds(self) -> float:
+        """Tracked seconds so far, not counting paused time"""
+        if self.paused or not self.active:
+            return self.elapsed
+        start_time = self.start_time
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        running_since = start_time.timestamp() + self.segments[-1]
+        return self.elapsed + datetime.now(timezone.utc).timestamp() - running_since
 
 class User(BaseModel):
     id: int
     telegram_id: str
     username: Optional[str] = None
+    timezone: str = "UTC"
     created_at: datetime
 
 # Schemas for creation/update
@@ -44,6 +77,12 @@ class TimerStart(BaseModel):
 class TimerStop(BaseModel):
     timer_id: int
 
+class TimerPause(BaseModel):
+    timer_id: int
+
+class TimerResume(BaseModel):
+    timer_id: int
+
 # --- Statistics Models ---
 
 class DailyStats(BaseModel):
@@ -74,3 +113,7 @@ class ProductivityTrend(BaseModel):
     day: str
     planned_time: int
     actual_time: int
+
+class ActivityHeatmap(BaseModel):
+    days: int
+    seconds: List[List[int]]
@@ -1,8 +1,8 @@
 import aiohttp
 from typing import Dict, List, Optional
 from ..models.api import (
-    Task, TaskCreate, Timer, TimerStart, TimerStop, User,
-    DailyStats, WeeklyStats, TagStats, ProductivityTrend
+    Task, TaskCreate, TaskPage, TaskSummaryPage, Timer, TimerStart, TimerStop, TimerPause, TimerResume, User,
+    DailyStats, WeeklyStats, TagStats, ProductivityTrend, ActivityHeatmap
 )
 
 class ApiClient:
@@ -49,18 +49,63 @@ class ApiClient:
             print(f"API call to get/create user failed: {e}")
             return None
 
+    async def update_user(self, user_id: int, timezone: Optional[str] = None) -> Optional[User]:
+        user_data = {"timezone": timezone}
+        try:
+            response = await self._request('PATCH', '/users/me', user_id=user_id, data=user_data)
+            return User.parse_obj(response)
+        except aiohttp.ClientError as e:
+            print(f"API call to update user failed: {e}")
+            return None
+
     # Task methods
     async def create_task(self, user_id: int, task_data: TaskCreate) -> Task:
         response = await self._request('POST', '/tasks/', user_id=user_id, data=task_data.dict())
         return Task.parse_obj(response)
 
-    async def get_tasks(self, user_id: int, completed: Optional[bool] = None) -> List[Task]:
+    async def get_task_summaries(
+        self,
+        user_id: int,
+        completed: Optional[bool] = None,
+        min_priority: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> TaskSummaryPage:
         params = {}
         if completed is not None:
-            params['completed'] = completed
-        response = await self._request('GET', '/tasks/', user_id=user_id, params=params)
+            params['completed'] = str(completed).lower()
+        if min_priority is not None:
+            params['min_priority'] = min_priority
+        if limit is not None:
+            params['limit'] = limit
+        if cursor:
+            params['cursor'] = cursor
+        response = await self._request('GET', '/tasks/compact', user_id=user_id, params=params)
+        return TaskSummaryPage.parse_obj(response)
+
+    async def search_tasks(self, user_id: int, query: str, limit: int = 10) -> List[Task]:
+        response = await self._request(
+            'GET', '/tasks/search', user_id=user_id, params={'q': query, 'limit': limit}
+        )
         return [Task.parse_obj(task) for task in response]
 
+    async def get_tasks(
+        self,
+        user_id: int,
+        completed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> TaskPage:
+        params = {}
+        if completed is not None:
+            params['completed'] = str(completed).lower()
+        if limit is not None:
+            params['limit'] = limit
+        if cursor:
+            params['cursor'] = cursor
+        response = await self._request('GET', '/tasks/', user_id=user_id, params=params)
+        return TaskPage.parse_obj(response)
+
     async def get_task(self, user_id: int, task_id: int) -> Optional[Task]:
         try:
             response = await self._request('GET', f'/tasks/{task_id}', user_id=user_id)
@@ -77,6 +122,18 @@ class ApiClient:
         except aiohttp.ClientError:
             return False
 
+    async def complete_tasks(self, user_id: int, task_ids: List[int]) -> List[Task]:
+        data = {"tasks": [{"id": task_id, "completed": True} for task_id in task_ids]}
+        response = await self._request('PATCH', '/tasks:bulk', user_id=user_id, data=data)
+        return [Task.parse_obj(task) for task in response]
+
+    async def delete_tasks(self, user_id: int, task_ids: List[int]) -> bool:
+        try:
+            await self._request('DELETE', '/tasks:bulk', user_id=user_id, data={"task_ids": task_ids})
+            return True
+        except aiohttp.ClientError:
+            return False
+
     # Timer methods
     async def start_timer(self, user_id: int, task_id: int) -> Optional[Timer]:
         timer_data = TimerStart(task_id=task_id)
@@ -94,6 +151,22 @@ class ApiClient:
         except aiohttp.ClientError:
             return None
 
+    async def pause_timer(self, user_id: int, timer_id: int) -> Optional[Timer]:
+        timer_data = TimerPause(timer_id=timer_id)
+        try:
+            response = await self._request('POST', '/timer/pause', user_id=user_id, data=timer_data.dict())
+            return Timer.parse_obj(response)
+        except aiohttp.ClientError:
+            return None
+
+    async def resume_timer(self, user_id: int, timer_id: int) -> Optional[Timer]:
+        timer_data = TimerResume(timer_id=timer_id)
+        try:
+            response = await self._request('POST', '/timer/resume', user_id=user_id, data=timer_data.dict())
+            return Timer.parse_obj(response)
+        except aiohttp.ClientError:
+            return None
+
     async def get_active_timer(self, user_id: int) -> Optional[Timer]:
         try:
             response = await self._request('GET', '/timer/active', user_id=user_id)
@@ -103,6 +176,20 @@ class ApiClient:
         except aiohttp.ClientError:
             return None
 
+    async def get_users_with_auto_closed_timers(self) -> List[User]:
+        try:
+            response = await self._request('GET', '/timer/auto-closed/users')
+            return [User.parse_obj(user) for user in response]
+        except aiohttp.ClientError:
+            return []
+
+    async def report_auto_closed_timers(self, user_id: int) -> List[Timer]:
+        try:
+            response = await self._request('POST', '/timer/auto-closed:report', user_id=user_id)
+            return [Timer.parse_obj(timer) for timer in response]
+        except aiohttp.ClientError:
+            return []
+
     # Statistics methods
     async def get_daily_stats(self, user_id: int, date: Optional[str] = None) -> Optional[DailyStats]:
         params = {'date': date} if date else {}
@@ -135,4 +222,12 @@ class ApiClient:
             response = await self._request('GET', '/stats/trends', user_id=user_id, params=params)
             return [ProductivityTrend.parse_obj(trend) for trend in response]
         except aiohttp.ClientError:
-            return []
\ No newline at end of file
+            return []
+
+    async def get_activity_heatmap(self, user_id: int, days: int = 30) -> Optional[ActivityHeatmap]:
+        params = {'days': days}
+        try:
+            response = await self._request('GET', '/stats/heatmap', user_id=user_id, params=params)
+            return ActivityHeatmap.parse_obj(response)
+        except aiohttp.ClientError:
+            return None
@@ -21,17 +21,17 @@ class NotificationService:
                     break
                     
                 async with ApiClient("http://localhost:8000") as api_client:
+                    await self.send_auto_closed_notifications(api_client)
+
                     active_timer = await api_client.get_active_timer(user_id=1)
                     
-                    if active_timer:
+                    if active_timer and not active_timer.paused:
                         # Get the task details
                         task = await api_client.get_task(active_timer.task_id, user_id=1)
                         
                         if task:
                             # Calculate elapsed time
-                            from datetime import datetime
-                            start_time_naive = active_timer.start_time.replace(tzinfo=None)
-                            elapsed_minutes = int((datetime.now() - start_time_naive).total_seconds() // 60)
+                            elapsed_minutes = int(active_timer.elapsed_seconds() // 60)
                             
                             message = (
                                 f"⏰ Reminder: You've been working on '{task.title}' "
@@ -44,6 +44,17 @@ class NotificationService:
             except Exception as e:
                 print(f"Error in reminder service: {e}")
 
+    async def send_auto_closed_notifications(self, api_client: ApiClient):
+        """Tell every user with a timer the server stopped for running past the limit"""
+        for user in await api_client.get_users_with_auto_closed_timers():
+            for timer in await api_client.report_auto_closed_timers(user_id=user.id):
+                task = f"task ID {timer.task_id}" if timer.task_id is not None else "a deleted task"
+                message = (
+                    f"⏱️ Your timer for {task} was left running and was stopped automatically "
+                    f"after {round((timer.duration or 0) / 60)} minutes."
+                )
+                await self.bot.send_message(chat_id=user.telegram_id, text=message)
+
     async def send_completion_notification(self, user_id: str, task_title: str):
         """Send notification when a task is completed"""
         message = f"🎉 Great job! You've completed the task: '{task_title}'"
@@ -13,7 +13,7 @@ def format_task(task: TaskResponse) -> str:
     task_str = (
         f"{status} <b>{task.title}</b>\n"
         f"ID: {task.id}\n"
-        f"Estimated: {task.estimated_time} min | Actual: {task.actual_time_spent} min\n"
+        f"Estimated: {task.estimated_time} min | Actual: {round(task.actual_time_spent / 60)} min\n"
         f"Priority: {priority_stars}\n"
         f"Created: {task.created_at.strftime('%Y-%m-%d %H:%M') if task.created_at else 'N/A'}\n"
     )
@@ -46,7 +46,7 @@ def format_timer(timer: TimerResponse) -> str:
         timer_str += f"End: {timer.end_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
     
     if timer.duration:
-        timer_str += f"Duration: {timer.duration} minutes\n"
+        timer_str += f"Duration: {format_time_duration(round(timer.duration / 60))}\n"
     
     return timer_str.rstrip()
 
@@ -55,7 +55,7 @@ def format_daily_stats(stats: DailyStats) -> str:
     """Format daily statistics for display in the bot"""
     return (
         f"📅 <b>Statistics for {stats.date}</b>\n\n"
-        f"⏱️ Time spent: {stats.total_time_spent} minutes\n"
+        f"⏱️ Time spent: {round(stats.total_time_spent / 60)} minutes\n"
         f"✅ Completed tasks: {stats.completed_tasks}\n"
         f"📝 Active tasks: {stats.active_tasks}"
     )
@@ -65,13 +65,13 @@ def format_weekly_stats(stats: WeeklyStats) -> str:
     """Format weekly statistics for display in the bot"""
     stats_str = (
         f"📆 <b>Week's Statistics ({stats.week_start} to {stats.week_end})</b>\n\n"
-        f"⏱️ Total time spent: {stats.total_time_spent} minutes\n"
+        f"⏱️ Total time spent: {round(stats.total_time_spent / 60)} minutes\n"
         f"✅ Completed tasks: {stats.completed_tasks}\n\n"
         f"<b>Daily breakdown:</b>\n"
     )
     
     for day_stat in stats.daily_breakdown:
-        stats_str += f"  {day_stat.date}: {day_stat.total_time_spent} min, {day_stat.completed_tasks} tasks\n"
+        stats_str += f"  {day_stat.date}: {round(day_stat.total_time_spent / 60)} min, {day_stat.completed_tasks} tasks\n"
     
     return stats_str
 
@@ -85,7 +85,7 @@ def format_tag_stats(tag_stats: List[TagStats]) -> str:
     for tag_stat in tag_stats:
         stats_str += (
             f"  <b>{tag_stat.tag_name}</b>: "
-            f"{tag_stat.total_time_spent} min, "
+            f"{round(tag_stat.total_time_spent / 60)} min, "
             f"{tag_stat.task_count} tasks\n"
         )
     
@@ -114,7 +114,7 @@ def format_tasks_list(tasks: List[TaskResponse], title: str = "Tasks") -> str:
     for i, task in enumerate(tasks, 1):
         status = "✅" if task.completed else "⏳"
         tasks_str += f"{i}. {status} <b>{task.title}</b> ({'⭐' * task.priority})\n"
-        tasks_str += f"   ID: {task.id} | Est: {task.estimated_time} min\n"
+        tasks_str += f"   ID: {task.id} | Est: {task.estimated_time} min | Actual: {round(task.actual_time_spent / 60)} min\n"
         
         if task.tags:
             tag_names = [tag.name for tag in task.tags]
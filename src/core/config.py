@@ -17,6 +17,20 @@ class Settings(BaseSettings):
     app_version: str = "0.1.0"
     debug: bool = False
     
+    # Statistics cache settings
+    stats_cache_max_entries: int = 10000
+    stats_cache_ttl: int = 60  # seconds, for statistics that include the current day
+    stats_cache_finished_ttl: int = 3600  # seconds, for finished days; fallback if a worker misses a notification
+
+    # Active timer registry settings
+    active_timer_cache_ttl: int = 300  # seconds, fallback if a worker misses a notification
+
+    # Abandoned timer sweeper settings
+    max_timer_duration: int = 12 * 3600  # seconds, for users without their own limit
+    min_max_timer_duration: int = 3600  # seconds, lowest limit a user may set
+    timer_sweep_interval: int = 300  # seconds between sweeps
+    timer_sweep_batch_size: int = 500
+    
     class Config:
         env_file = ".env"
 
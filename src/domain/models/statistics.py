@@ -4,7 +4,7 @@ from typing import List, Optional
 
 class DailyStats(BaseModel):
     date: str
-    total_time_spent: int  # in minutes
+    total_time_spent: int  # in seconds
     completed_tasks: int
     active_tasks: int
 
@@ -12,7 +12,7 @@ class DailyStats(BaseModel):
 class WeeklyStats(BaseModel):
     week_start: str
     week_end: str
-    total_time_spent: int  # in minutes
+    total_time_spent: int  # in seconds
     completed_tasks: int
     daily_breakdown: List[DailyStats]
 
@@ -20,12 +20,34 @@ class WeeklyStats(BaseModel):
 class TagStats(BaseModel):
     tag_id: int
     tag_name: str
-    total_time_spent: int  # in minutes
+    total_time_spent: int  # in seconds
     task_count: int
 
 
 class ProductivityTrend(BaseModel):
     day: str
-    planned_time: int  # in minutes
-    actual_time: int  # in minutes
-    completed_tasks: int
\ No newline at end of file
+    planned_time: int  # in seconds
+    actual_time: int  # in seconds
+    completed_tasks: int
+
+
+class StatsBucket(BaseModel):
+    start: str
+    end: str
+    total_time_spent: int  # in seconds
+    completed_tasks: int
+    active_tasks: int
+
+
+class RangeStats(BaseModel):
+    start: str
+    end: str
+    granularity: str  # day, week or month
+    total_time_spent: int  # in seconds
+    completed_tasks: int
+    buckets: List[StatsBucket]
+
+
+class ActivityHeatmap(BaseModel):
+    days: int  # Length of the period, ending now
+    seconds: List[List[int]]  # 7 rows (Monday first) x 24 hours of tracked seconds
\ No newline at end of file
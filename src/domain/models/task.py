@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from datetime import datetime
+from .timer import TimerResponse as TimerSessionResponse
 
 
 # User Models
@@ -75,13 +76,71 @@ class TaskResponse(TaskBase):
     user_id: int
     created_at: datetime
     completed_at: Optional[datetime] = None
-    actual_time_spent: int = 0
+    actual_time_spent: int = 0  # in seconds
     tags: List[TagResponse] = []
 
     class Config:
         from_attributes = True
 
 
+class TaskSummary(BaseModel):
+    """The columns list views show; tags are tag names"""
+    id: int
+    title: str
+    priority: int = 1
+    completed: bool = False
+    tags: List[str] = []
+
+
+class TaskSummaryPage(BaseModel):
+    items: List[TaskSummary]
+    next_cursor: Optional[str] = None
+
+
+class TaskDetailResponse(TaskResponse):
+    session_count: int = 0  # Finished timer sessions
+    recent_sessions: List[TimerSessionResponse] = []  # Latest finished sessions, newest first
+
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` to get the next page; None on the last page
+
+
+# Bulk Task Models
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=1000)
+
+    @field_validator("tasks")
+    @classmethod
+    def check_unique_ids(cls, tasks: List[TaskBulkUpdateItem]) -> List[TaskBulkUpdateItem]:
+        if len({task.id for task in tasks}) != len(tasks):
+            raise ValueError("each task may appear only once")
+        return tasks
+
+
+class TaskBulkDelete(BaseModel):
+    task_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+    @field_validator("task_ids")
+    @classmethod
+    def drop_duplicates(cls, task_ids: List[int]) -> List[int]:
+        return list(dict.fromkeys(task_ids))
+
+
+class TaskBulkDeleteResponse(BaseModel):
+    deleted: int
+    task_ids: List[int]
+
+
 # Timer Models
 class TimerBase(BaseModel):
     task_id: int
@@ -109,7 +168,7 @@ class TimerResponse(TimerBase):
 # Statistics Models
 class DailyStats(BaseModel):
     date: str
-    total_time_spent: int  # in minutes
+    total_time_spent: int  # in seconds
     completed_tasks: int
     active_tasks: int
 
@@ -117,7 +176,7 @@ class DailyStats(BaseModel):
 class WeeklyStats(BaseModel):
     week_start: str
     week_end: str
-    total_time_spent: int  # in minutes
+    total_time_spent: int  # in seconds
     completed_tasks: int
     daily_breakdown: List[DailyStats]
 
@@ -125,5 +184,5 @@ class WeeklyStats(BaseModel):
 class TagStats(BaseModel):
     tag_id: int
     tag_name: str
-    total_time_spent: int  # in minutes
+    total_time_spent: int  # in seconds
     task_count: int
\ No newline at end of file
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class TimerStart(BaseModel):
@@ -11,13 +11,53 @@ class TimerStop(BaseModel):
     timer_id: int
 
 
+class TimerPause(BaseModel):
+    timer_id: int
+
+
+class TimerResume(BaseModel):
+    timer_id: int
+
+
+class TimerSessionImport(BaseModel):
+    task_id: int
+    start_time: datetime
+    end_time: datetime
+
+    @model_validator(mode="after")
+    def check_interval(self) -> "TimerSessionImport":
+        # Naive timestamps from offline clients are taken as UTC
+        if self.start_time.tzinfo is None:
+            self.start_time = self.start_time.replace(tzinfo=timezone.utc)
+        if self.end_time.tzinfo is None:
+            self.end_time = self.end_time.replace(tzinfo=timezone.utc)
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        if self.end_time > datetime.now(timezone.utc):
+            raise ValueError("end_time must not be in the future")
+        return self
+
+
+class TimerSessionBulkImport(BaseModel):
+    sessions: List[TimerSessionImport] = Field(..., min_length=1, max_length=10000)
+
+
+class TimerSessionBulkImportResponse(BaseModel):
+    imported: int
+    session_ids: List[int]
+
+
 class TimerResponse(BaseModel):
     id: int
-    task_id: int
+    task_id: Optional[int] = None  # None once the session's task has been deleted
     start_time: datetime
     end_time: Optional[datetime] = None
-    duration: Optional[int] = None
+    duration: Optional[int] = None  # in seconds, excluding paused time
     active: bool
+    paused: bool = False
+    segments: List[int] = []  # [run, pause, run, ...] offsets in seconds from start_time
+    elapsed: int = 0  # Seconds tracked in closed segments
+    auto_closed: bool = False  # Stopped by the abandoned timer sweep
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from ..models.task import TaskCreate, TaskUpdate, TaskResponse
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.engine import RowMapping
+from ..models.task import TaskCreate, TaskUpdate, TaskResponse, TaskBulkUpdateItem
+from ...infrastructure.database.models import Task, TimerSession
 
 
 class ITaskRepository(ABC):
@@ -9,11 +12,13 @@ class ITaskRepository(ABC):
     async def get_filtered_tasks(
         self, 
         user_id: int, 
-        skip: int, 
         limit: int,
+        after: Optional[Tuple[datetime, int]],
         completed: Optional[bool],
         priority: Optional[int],
+        min_priority: Optional[int],
         tag_id_list: Optional[List[int]],
+        tag_mode: str,
         title_contains: Optional[str],
         estimated_time_min: Optional[int],
         estimated_time_max: Optional[int],
@@ -21,7 +26,26 @@ class ITaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_task_with_details(self, task_id: int, user_id: int) -> Optional[TaskResponse]:
+    async def get_task_summaries(
+        self,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]],
+        **filters
+    ) -> List[RowMapping]:
+        pass
+
+    @abstractmethod
+    async def search_tasks(self, user_id: int, query: str, limit: int) -> List[TaskResponse]:
+        pass
+
+    @abstractmethod
+    async def get_task_with_details(
+        self,
+        task_id: int,
+        user_id: int,
+        recent_sessions: int
+    ) -> Optional[Tuple[Task, int, List[TimerSession]]]:
         pass
 
     @abstractmethod
@@ -33,9 +57,17 @@ class ITaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def delete(self, task_id: int) -> bool:
+    async def create_tasks(self, user_id: int, tasks_data: List[TaskCreate]) -> List[TaskResponse]:
         pass
-    
+
+    @abstractmethod
+    async def update_tasks(self, user_id: int, updates: List[TaskBulkUpdateItem]) -> Optional[List[TaskResponse]]:
+        pass
+
+    @abstractmethod
+    async def delete_tasks(self, user_id: int, task_ids: List[int]) -> Optional[List[int]]:
+        pass
+
     @abstractmethod
     async def get(self, task_id: int) -> Optional[TaskResponse]:
         pass
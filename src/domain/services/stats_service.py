@@ -1,79 +1,56 @@
-from typing import List
+from typing import Any, Awaitable, Callable, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, and_, extract, select
-from datetime import datetime, timedelta
-from ..domain.models.statistics import DailyStats, WeeklyStats, TagStats, ProductivityTrend
-from ..infrastructure.database.models import Task, TimerSession, Tag, task_tags
+from sqlalchemy import func, and_, extract, select, join, cast, literal_column, Date
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from ..domain.models.statistics import (
+    DailyStats, WeeklyStats, TagStats, ProductivityTrend, StatsBucket, RangeStats, ActivityHeatmap
+)
+from ..infrastructure.database.models import Task, TimerSession, Tag, User, UserDailyStats, TaskDailyStats, task_tags
 from ..infrastructure.database.repositories.base import BaseRepository
+from ..infrastructure.database.repositories.user_repository import UserRepository
+from ..infrastructure.database.repositories.daily_stats_repository import run_segments
+from ..infrastructure.cache.stats_cache import stats_cache, StatsCacheKey
+
+
+GRANULARITIES = ("day", "week", "month")
 
 
 class StatsService:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
-    async def get_daily_stats(self, user_id: int, date: str) -> DailyStats:
-        """Get statistics for a specific date"""
-        # Parse the date string
-        target_date = datetime.strptime(date, "%Y-%m-%d").date()
-        
-        # Query for completed tasks on that date
-        completed_tasks_query = await self.db_session.execute(
-            func.count(Task.id).filter(
-                and_(
-                    Task.user_id == user_id,
-                    func.date(Task.completed_at) == target_date,
-                    Task.completed == True
-                )
-            )
-        )
-        completed_tasks = completed_tasks_query.scalar() or 0
-        
-        # Query for active tasks on that date
-        active_tasks_query = await self.db_session.execute(
-            func.count(Task.id).filter(
-                and_(
-                    Task.user_id == user_id,
-                    func.date(Task.created_at) == target_date,
-                    Task.completed == False
-                )
-            )
-        )
-        active_tasks = active_tasks_query.scalar() or 0
-        
-        # Query for total time spent on that date
-        time_spent_query = await self.db_session.execute(
-            func.sum(TimerSession.duration).filter(
-                and_(
-                    TimerSession.active == False,  # Only completed sessions
-                    func.date(TimerSession.end_time) == target_date,
-                    Task.user_id == user_id
-                )
-            ).select_from(
-                TimerSession.__table__.join(Task, TimerSession.task_id == Task.id)
-            )
-        )
-        total_time_spent = time_spent_query.scalar() or 0
-        
-        return DailyStats(
-            date=date,
-            total_time_spent=total_time_spent,
-            completed_tasks=completed_tasks,
-            active_tasks=active_tasks
+    async def get_daily_stats(self, user_id: int, date: Optional[str] = None) -> DailyStats:
+        """Get statistics for a specific date, today in the user's time zone by default"""
+        if date:
+            target_date = datetime.strptime(date, "%Y-%m-%d").date()
+        else:
+            target_date = await self._today(user_id)
+        return await self._cached(
+            (user_id, "daily", target_date),
+            target_date,
+            lambda: self._compute_daily_stats(user_id, target_date)
         )
 
+    async def _compute_daily_stats(self, user_id: int, target_date: date) -> DailyStats:
+        daily_breakdown = await self._get_daily_breakdown(user_id, target_date, target_date)
+        return daily_breakdown[0]
+
     async def get_weekly_stats(self, user_id: int) -> WeeklyStats:
         """Get statistics for the current week"""
-        today = datetime.today()
+        today = await self._today(user_id)
+        return await self._cached(
+            (user_id, "weekly", today),
+            today,
+            lambda: self._compute_weekly_stats(user_id, today)
+        )
+
+    async def _compute_weekly_stats(self, user_id: int, today: date) -> WeeklyStats:
         week_start = today - timedelta(days=today.weekday())  # Monday
         week_end = week_start + timedelta(days=6)  # Sunday
         
-        # Get daily breakdown for the week
-        daily_breakdown = []
-        for i in range(7):
-            day = week_start + timedelta(days=i)
-            day_str = day.strftime("%Y-%m-%d")
-            daily_stat = await self.get_daily_stats(user_id, day_str)
-            daily_breakdown.append(daily_stat)
+        # All seven days come back from a single grouped query
+        daily_breakdown = await self._get_daily_breakdown(user_id, week_start, week_end)
         
         # Calculate weekly totals
         total_time_spent = sum(day.total_time_spent for day in daily_breakdown)
@@ -87,75 +64,327 @@ class StatsService:
             daily_breakdown=daily_breakdown
         )
 
+    async def get_range_stats(
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        granularity: str = "day"
+    ) -> RangeStats:
+        """Get per-bucket statistics for an arbitrary date range"""
+        return await self._cached(
+            (user_id, "range", (start_date, end_date, granularity)),
+            end_date,
+            lambda: self._compute_range_stats(user_id, start_date, end_date, granularity)
+        )
+
+    async def _compute_range_stats(
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        granularity: str
+    ) -> RangeStats:
+        rows = await self._get_breakdown(user_id, start_date, end_date, granularity)
+
+        buckets = []
+        for index, row in enumerate(rows):
+            # A bucket ends the day before the next one starts, clipped to the range
+            if index + 1 < len(rows):
+                bucket_end = rows[index + 1].bucket - timedelta(days=1)
+            else:
+                bucket_end = end_date
+            buckets.append(
+                StatsBucket(
+                    start=max(row.bucket, start_date).strftime("%Y-%m-%d"),
+                    end=bucket_end.strftime("%Y-%m-%d"),
+                    total_time_spent=row.total_time_spent,
+                    completed_tasks=row.completed_tasks,
+                    active_tasks=row.active_tasks
+                )
+            )
+
+        return RangeStats(
+            start=start_date.strftime("%Y-%m-%d"),
+            end=end_date.strftime("%Y-%m-%d"),
+            granularity=granularity,
+            total_time_spent=sum(bucket.total_time_spent for bucket in buckets),
+            completed_tasks=sum(bucket.completed_tasks for bucket in buckets),
+            buckets=buckets
+        )
+
+    async def _get_daily_breakdown(self, user_id: int, start_date: date, end_date: date) -> List[DailyStats]:
+        """Get one DailyStats row per day in [start_date, end_date] using a single query"""
+        rows = await self._get_breakdown(user_id, start_date, end_date, "day")
+        return [
+            DailyStats(
+                date=row.bucket.strftime("%Y-%m-%d"),
+                total_time_spent=row.total_time_spent,
+                completed_tasks=row.completed_tasks,
+                active_tasks=row.active_tasks
+            )
+            for row in rows
+        ]
+
+    async def _get_breakdown(self, user_id: int, start_date: date, end_date: date, granularity: str):
+        """
+        Aggregate the user_daily_stats rollup per bucket in one query.
+        The rollup is left-joined onto a generated bucket series, so empty
+        buckets still come back as zeros. Buckets are labelled by their
+        (truncated) start date. The cost depends on the length of the range,
+        not on how many tasks or sessions the user has.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+
+        buckets = (
+            func.generate_series(
+                func.date_trunc(granularity, start_date),
+                end_date,
+                literal_column(f"interval '1 {granularity}'")
+            )
+            .table_valued("bucket")
+            .render_derived(name="buckets")
+        )
+        bucket = cast(buckets.c.bucket, Date)
+
+        rollup_bucket = cast(func.date_trunc(granularity, UserDailyStats.day), Date)
+        rollup = (
+            select(
+                rollup_bucket.label("bucket"),
+                func.sum(UserDailyStats.time_spent).label("total_time_spent"),
+                func.sum(UserDailyStats.completed_tasks).label("completed_tasks"),
+                func.sum(UserDailyStats.planned_time).label("planned_time"),
+                func.sum(UserDailyStats.active_tasks).label("active_tasks")
+            )
+            .where(
+                UserDailyStats.user_id == user_id,
+                UserDailyStats.day.between(start_date, end_date)
+            )
+            .group_by(rollup_bucket)
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                bucket.label("bucket"),
+                func.coalesce(rollup.c.total_time_spent, 0).label("total_time_spent"),
+                func.coalesce(rollup.c.completed_tasks, 0).label("completed_tasks"),
+                func.coalesce(rollup.c.planned_time, 0).label("planned_time"),
+                func.coalesce(rollup.c.active_tasks, 0).label("active_tasks")
+            )
+            .select_from(buckets)
+            .outerjoin(rollup, rollup.c.bucket == bucket)
+            .order_by(bucket)
+        )
+
+        result = await self.db_session.execute(stmt)
+        return result.all()
+
+    async def _cached(self, key: StatsCacheKey, last_day: Optional[date], compute: Callable[[], Awaitable[Any]]):
+        """
+        Serve a statistic from the per-user cache, computing it on a miss.
+        Results whose last day is today or later (or None, meaning today) may
+        still change and expire after the short TTL; results about finished
+        days are kept until the user's data changes (or the long TTL passes).
+        Nothing is cached if the data changed while the result was computed.
+        """
+        cached = stats_cache.get(key)
+        if cached is not None:
+            return cached
+
+        user_id = key[0]
+        generation = stats_cache.generation(user_id)
+        result = await compute()
+        current = last_day is None or last_day >= await self._today(user_id)
+        stats_cache.set(key, result, current=current, generation=generation)
+        return result
+
+    async def _timezone(self, user_id: int) -> str:
+        """The user's time zone name, looked up once and kept until the user's data changes"""
+        key = (user_id, "timezone", None)
+        tz_name = stats_cache.get(key)
+        if tz_name is None:
+            generation = stats_cache.generation(user_id)
+            tz_name = await UserRepository(self.db_session).get_timezone(user_id)
+            stats_cache.set(key, tz_name, current=False, generation=generation)
+        return tz_name
+
+    async def _today(self, user_id: int) -> date:
+        """The current calendar date in the user's time zone"""
+        return datetime.now(ZoneInfo(await self._timezone(user_id))).date()
+
     async def get_tag_stats(self, user_id: int, tag_ids: List[int], period_days: int = 30) -> List[TagStats]:
         """Get statistics for specific tags over a period"""
-        from sqlalchemy import and_, or_
+        return await self._cached(
+            (user_id, "tags", (tuple(sorted(tag_ids or [])), period_days)),
+            None,
+            lambda: self._compute_tag_stats(user_id, tag_ids, period_days)
+        )
+
+    async def _compute_tag_stats(self, user_id: int, tag_ids: List[int], period_days: int) -> List[TagStats]:
+        """
+        Tag totals from the per-task daily rollup. Each task's time in the
+        period is summed once before it meets task_tags, so a task counts once
+        per tag no matter how many sessions it has, and the query reads
+        (task, day) rows rather than raw sessions.
+        """
+        cutoff_day = await self._today(user_id) - timedelta(days=period_days)
+
+        user_tags = [Tag.user_id == user_id]
+        if tag_ids:
+            user_tags.append(Tag.id.in_(tag_ids))
+
+        tagged_tasks = (
+            select(task_tags.c.tag_id, task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(*user_tags)
+            .distinct()
+            .subquery()
+        )
+
+        task_time = (
+            select(
+                TaskDailyStats.task_id,
+                func.sum(TaskDailyStats.time_spent).label("time_spent")
+            )
+            .where(
+                TaskDailyStats.task_id.in_(select(tagged_tasks.c.task_id)),
+                TaskDailyStats.day >= cutoff_day
+            )
+            .group_by(TaskDailyStats.task_id)
+            .subquery()
+        )
 
-        cutoff_date = datetime.now() - timedelta(days=period_days)
+        tag_totals = (
+            select(
+                tagged_tasks.c.tag_id,
+                func.count(tagged_tasks.c.task_id).label("task_count"),
+                func.sum(task_time.c.time_spent).label("total_time_spent")
+            )
+            .select_from(tagged_tasks)
+            .outerjoin(task_time, task_time.c.task_id == tagged_tasks.c.task_id)
+            .group_by(tagged_tasks.c.tag_id)
+            .subquery()
+        )
 
-        # Build the query using SQLAlchemy's select statement for async
         stmt = (
             select(
                 Tag.id.label('tag_id'),
                 Tag.name.label('tag_name'),
-                func.coalesce(func.sum(TimerSession.duration), 0).label('total_time_spent'),
-                func.count(Task.id).label('task_count')
+                func.coalesce(tag_totals.c.total_time_spent, 0).label('total_time_spent'),
+                func.coalesce(tag_totals.c.task_count, 0).label('task_count')
             )
-            .select_from(
-                Tag.__table__
-                .outerjoin(task_tags, Tag.id == task_tags.c.tag_id)
-                .outerjoin(Task, task_tags.c.task_id == Task.id)
-                .outerjoin(TimerSession, Task.id == TimerSession.task_id)
+            .outerjoin(tag_totals, tag_totals.c.tag_id == Tag.id)
+            .where(*user_tags)
+            .order_by(Tag.id)
+        )
+
+        results = await self.db_session.execute(stmt)
+        return [
+            TagStats(
+                tag_id=row.tag_id,
+                tag_name=row.tag_name,
+                total_time_spent=row.total_time_spent,
+                task_count=row.task_count
             )
-            .where(Tag.user_id == user_id)
-            .where(
-                or_(
-                    TimerSession.end_time.is_(None),
-                    TimerSession.end_time >= cutoff_date
-                )
+            for row in results
+        ]
+
+    async def get_productivity_trends(self, user_id: int, days: int = 7) -> List[ProductivityTrend]:
+        """
+        Get productivity trends over the specified number of days.
+        Planned time is the estimated time of the tasks completed on a day,
+        actual time is the time tracked on that day.
+        """
+        today = await self._today(user_id)
+        return await self._cached(
+            (user_id, "trends", (today, days)),
+            today,
+            lambda: self._compute_productivity_trends(user_id, today, days)
+        )
+
+    async def _compute_productivity_trends(self, user_id: int, today: date, days: int) -> List[ProductivityTrend]:
+        rows = await self._get_breakdown(user_id, today - timedelta(days=days - 1), today, "day")
+
+        # Most recent day first
+        return [
+            ProductivityTrend(
+                day=row.bucket.strftime("%Y-%m-%d"),
+                planned_time=row.planned_time,
+                actual_time=row.total_time_spent,
+                completed_tasks=row.completed_tasks
             )
-            .group_by(Tag.id, Tag.name)
+            for row in reversed(rows)
+        ]
+
+    async def get_activity_heatmap(self, user_id: int, days: int = 30) -> ActivityHeatmap:
+        """Get tracked seconds per weekday and hour of day over the last `days` days"""
+        return await self._cached(
+            (user_id, "heatmap", days),
+            None,
+            lambda: self._compute_activity_heatmap(user_id, days)
         )
 
-        # Apply tag filter if specific tags are requested
-        if tag_ids:
-            stmt = stmt.where(Tag.id.in_(tag_ids))
+    async def _compute_activity_heatmap(self, user_id: int, days: int) -> ActivityHeatmap:
+        """
+        Split every run segment of the finished sessions across the local
+        hour boundaries it spans and sum the overlap per (weekday, hour) in
+        one query. Local hour starts are turned back into instants in the
+        owner's time zone and intersected with the segments on timestamptz,
+        as segment_days does for midnights, so a DST day's repeated or skipped
+        hour neither adds nor loses time. Paused time is left out. At most 168
+        rows come back and are laid out into the matrix here.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        one_hour = literal_column("interval '1 hour'")
 
-        results = await self.db_session.execute(stmt)
-        rows = results.fetchall()
-
-        tag_stats_list = []
-        for row in rows:
-            tag_stats_list.append(
-                TagStats(
-                    tag_id=row.tag_id,
-                    tag_name=row.tag_name,
-                    total_time_spent=row.total_time_spent or 0,
-                    task_count=row.task_count or 0
-                )
+        segments, segment_start, segment_end = run_segments(TimerSession)
+        # One spare hour on each side: around a DST change a local hour's
+        # instants can sit an hour away from the naive wall-clock reading
+        hours = (
+            func.generate_series(
+                func.date_trunc('hour', func.timezone(User.timezone, segment_start)) - one_hour,
+                func.timezone(User.timezone, segment_end) + one_hour,
+                one_hour
             )
+            .table_valued("hour_start")
+            .render_derived(name="hours")
+        )
+        hour_start = hours.c.hour_start
 
-        return tag_stats_list
+        # Local hour boundaries as instants never decrease, so the hours tile
+        # the timeline and the clamped overlaps add up to the segment
+        overlap = extract(
+            'epoch',
+            func.least(segment_end, func.timezone(User.timezone, hour_start + one_hour))
+            - func.greatest(segment_start, func.timezone(User.timezone, hour_start))
+        )
+        weekday = extract('isodow', hour_start)
+        hour = extract('hour', hour_start)
 
-    async def get_productivity_trends(self, user_id: int, days: int = 7) -> List[ProductivityTrend]:
-        """Get productivity trends over the specified number of days"""
-        trends = []
-        for i in range(days):
-            day = datetime.now() - timedelta(days=i)
-            day_str = day.strftime("%Y-%m-%d")
-            
-            # Get daily stats for this day
-            daily_stats = await self.get_daily_stats(user_id, day_str)
-            
-            # For now, we'll use actual time as both planned and actual
-            # In a real implementation, we would compare estimated vs actual time
-            trends.append(
-                ProductivityTrend(
-                    day=day_str,
-                    planned_time=daily_stats.total_time_spent,  # Placeholder
-                    actual_time=daily_stats.total_time_spent,
-                    completed_tasks=daily_stats.completed_tasks
-                )
+        stmt = (
+            select(
+                weekday.label("weekday"),
+                hour.label("hour"),
+                func.sum(func.greatest(overlap, 0)).label("seconds")
             )
-        
-        return trends
\ No newline at end of file
+            .select_from(
+                join(TimerSession, User, TimerSession.user_id == User.id),
+                segments,
+                hours
+            )
+            .where(
+                TimerSession.user_id == user_id,
+                TimerSession.active == False,
+                TimerSession.end_time >= cutoff
+            )
+            .group_by(weekday, hour)
+        )
+
+        seconds = [[0] * 24 for _ in range(7)]
+        result = await self.db_session.execute(stmt)
+        for row in result:
+            seconds[int(row.weekday) - 1][int(row.hour)] = int(row.seconds)
+
+        return ActivityHeatmap(days=days, seconds=seconds)
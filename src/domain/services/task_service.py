@@ -1,8 +1,16 @@
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..domain.models.task import TaskCreate, TaskUpdate, TaskResponse
+from ..domain.models.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskDetailResponse, TaskPage, TaskSummary, TaskSummaryPage,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkDeleteResponse
+)
+from ..domain.models.timer import TimerResponse as TimerSessionResponse
+from ..core.pagination import encode_cursor, decode_cursor
 from ..infrastructure.database.repositories.task_repository import TaskRepository
 from ..infrastructure.database.repositories.tag_repository import TagRepository
+from ..infrastructure.cache.stats_cache import stats_cache
+from ..infrastructure.cache.active_timers import active_timers
 
 
 class TaskService:
@@ -13,39 +21,101 @@ class TaskService:
     async def create_task(self, task_data: TaskCreate, user_id: int) -> TaskResponse:
         """Create a new task with associated tags"""
         task = await self.task_repository.create_task_with_tags(task_data, user_id)
+        stats_cache.invalidate_user(user_id)
         return TaskResponse.from_orm(task)
 
-    async def get_task(self, task_id: int, user_id: int) -> Optional[TaskResponse]:
-        """Get a specific task by ID for a user"""
-        task = await self.task_repository.get_task_with_details(task_id, user_id)
-        if task:
-            return TaskResponse.from_orm(task)
-        return None
+    async def get_task(self, task_id: int, user_id: int, recent_sessions: int = 0) -> Optional[TaskDetailResponse]:
+        """Get a specific task by ID for a user, with its session totals and latest sessions"""
+        details = await self.task_repository.get_task_with_details(task_id, user_id, recent_sessions)
+        if not details:
+            return None
+
+        task, session_count, sessions = details
+        response = TaskDetailResponse.from_orm(task)
+        response.session_count = session_count
+        response.recent_sessions = [TimerSessionResponse.from_orm(session) for session in sessions]
+        return response
 
     async def get_tasks(
         self, 
         user_id: int, 
-        skip: int = 0, 
         limit: int = 100,
+        cursor: Optional[str] = None,
         completed: Optional[bool] = None,
         priority: Optional[int] = None,
+        min_priority: Optional[int] = None,
         tag_id_list: Optional[List[int]] = None,
+        tag_mode: str = "any",
         title_contains: Optional[str] = None,
         estimated_time_min: Optional[int] = None,
         estimated_time_max: Optional[int] = None,
-    ) -> List[TaskResponse]:
-        """Get all tasks for a user with optional filtering"""
+    ) -> TaskPage:
+        """
+        Get a page of a user's tasks, newest first, with optional filtering.
+        Raises ValueError for a malformed cursor.
+        """
+        # One extra row tells whether there is a next page
         tasks = await self.task_repository.get_filtered_tasks(
             user_id=user_id,
-            skip=skip,
-            limit=limit,
+            limit=limit + 1,
+            after=self._decode_cursor(cursor),
             completed=completed,
             priority=priority,
+            min_priority=min_priority,
             tag_id_list=tag_id_list,
+            tag_mode=tag_mode,
             title_contains=title_contains,
             estimated_time_min=estimated_time_min,
             estimated_time_max=estimated_time_max,
         )
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        return TaskPage(items=[TaskResponse.from_orm(task) for task in tasks], next_cursor=next_cursor)
+
+    async def get_task_summaries(
+        self,
+        user_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters
+    ) -> TaskSummaryPage:
+        """
+        Like get_tasks, but only the fields list views need, read as plain rows.
+        Takes the same filters and cursors. Raises ValueError for a malformed cursor.
+        """
+        rows = await self.task_repository.get_task_summaries(
+            user_id=user_id,
+            limit=limit + 1,
+            after=self._decode_cursor(cursor),
+            **filters
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return TaskSummaryPage(
+            items=[TaskSummary(**{**row, "tags": row["tags"] or []}) for row in rows],
+            next_cursor=next_cursor
+        )
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]):
+        """The (created_at, id) keyset a page cursor stands for; ValueError if it is malformed"""
+        if not cursor:
+            return None
+        values = decode_cursor(cursor)
+        try:
+            return datetime.fromisoformat(values[0]), int(values[1])
+        except (IndexError, TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+
+    async def search_tasks(self, user_id: int, query: str, limit: int = 20) -> List[TaskResponse]:
+        """Full-text search over a user's task titles and descriptions, best match first"""
+        tasks = await self.task_repository.search_tasks(user_id, query, limit)
         return [TaskResponse.from_orm(task) for task in tasks]
 
     async def update_task(
@@ -57,13 +127,38 @@ class TaskService:
         """Update a task for a user"""
         task = await self.task_repository.update_task_with_tags(task_id, task_data, user_id)
         if task:
+            stats_cache.invalidate_user(user_id)
             return TaskResponse.from_orm(task)
         return None
 
     async def delete_task(self, task_id: int, user_id: int) -> bool:
         """Delete a task for a user"""
-        # First get the task to verify ownership
-        task = await self.task_repository.get(task_id)
-        if task and task.user_id == user_id:
-            return await self.task_repository.delete(task_id)
-        return False
\ No newline at end of file
+        deleted = await self.task_repository.delete_tasks(user_id, [task_id])
+        if deleted is None:
+            return False
+        stats_cache.invalidate_user(user_id)
+        active_timers.invalidate(user_id)
+        return True
+
+    async def create_tasks(self, bulk_data: TaskBulkCreate, user_id: int) -> List[TaskResponse]:
+        """Create many tasks at once"""
+        tasks = await self.task_repository.create_tasks(user_id, bulk_data.tasks)
+        stats_cache.invalidate_user(user_id)
+        return [TaskResponse.from_orm(task) for task in tasks]
+
+    async def update_tasks(self, bulk_data: TaskBulkUpdate, user_id: int) -> Optional[List[TaskResponse]]:
+        """Update many tasks at once; None if any of them is not the user's"""
+        tasks = await self.task_repository.update_tasks(user_id, bulk_data.tasks)
+        if tasks is None:
+            return None
+        stats_cache.invalidate_user(user_id)
+        return [TaskResponse.from_orm(task) for task in tasks]
+
+    async def delete_tasks(self, bulk_data: TaskBulkDelete, user_id: int) -> Optional[TaskBulkDeleteResponse]:
+        """Delete many tasks at once; None if any of them is not the user's"""
+        task_ids = await self.task_repository.delete_tasks(user_id, bulk_data.task_ids)
+        if task_ids is None:
+            return None
+        stats_cache.invalidate_user(user_id)
+        active_timers.invalidate(user_id)
+        return TaskBulkDeleteResponse(deleted=len(task_ids), task_ids=task_ids)
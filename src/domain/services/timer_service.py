@@ -1,9 +1,15 @@
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
-from ..domain.models.timer import TimerStart, TimerStop, TimerResponse
+from ..domain.models.timer import (
+    TimerStart, TimerStop, TimerResponse, TimerSessionBulkImport, TimerSessionBulkImportResponse
+)
+from ..domain.models.task import UserResponse
 from ..infrastructure.database.repositories.timer_repository import TimerRepository
 from ..infrastructure.database.repositories.task_repository import TaskRepository
+from ..infrastructure.cache.stats_cache import stats_cache
+from ..infrastructure.cache.active_timers import active_timers
 
 
 class TimerService:
@@ -11,55 +17,93 @@ class TimerService:
         self.timer_repository = TimerRepository(db_session)
         self.task_repository = TaskRepository(db_session)
 
+    START_ATTEMPTS = 3
+
     async def start_timer(self, timer_data: TimerStart, user_id: int) -> Optional[TimerResponse]:
-        """Start a timer for a task"""
-        # Verify that the task belongs to the user
-        task = await self.task_repository.get(timer_data.task_id)
-        if not task or task.user_id != user_id:
+        """
+        Start a timer for a task, stopping the user's active timer in the same
+        transaction. Raises IntegrityError if concurrent starts keep winning
+        the one-active-timer index.
+        """
+        version = active_timers.version(user_id)
+        for attempt in range(self.START_ATTEMPTS):
+            try:
+                timer_session = await self.timer_repository.start_timer_session(timer_data.task_id, user_id)
+                break
+            except IntegrityError:
+                # A concurrent start won the one-active-timer index; stopping its
+                # timer and starting ours is what a second tap should do
+                if attempt == self.START_ATTEMPTS - 1:
+                    raise
+        if not timer_session:
             return None
 
-        # Check if there's already an active timer for this user
-        active_timer = await self.timer_repository.get_active_timer_for_user(user_id)
-        if active_timer:
-            # Stop the existing timer first
-            await self.timer_repository.stop_timer_session(active_timer.id)
-
-        # Create a new timer session
-        timer_session = await self.timer_repository.create_timer_session(timer_data.task_id)
-        return TimerResponse.from_orm(timer_session)
+        stats_cache.invalidate_user(user_id)
+        response = TimerResponse.from_orm(timer_session)
+        active_timers.set(user_id, response, version)
+        return response
 
     async def stop_timer(self, timer_data: TimerStop, user_id: int) -> Optional[TimerResponse]:
         """Stop a timer session"""
-        timer_session = await self.timer_repository.get(timer_data.timer_id)
-        if not timer_session:
+        stopped_timer = await self.timer_repository.stop_timer_session(timer_data.timer_id, user_id)
+        if not stopped_timer:
             return None
 
-        # Verify that the timer belongs to a task owned by the user
-        task = await self.task_repository.get(timer_session.task_id)
-        if not task or task.user_id != user_id:
+        stats_cache.invalidate_user(user_id)
+        active_timers.invalidate(user_id)
+        return TimerResponse.from_orm(stopped_timer)
+
+    async def import_sessions(
+        self,
+        import_data: TimerSessionBulkImport,
+        user_id: int
+    ) -> Optional[TimerSessionBulkImportResponse]:
+        """Import finished sessions recorded offline or in another tracker"""
+        session_ids = await self.timer_repository.import_sessions(user_id, import_data.sessions)
+        if session_ids is None:
             return None
 
-        # Stop the timer
-        stopped_timer = await self.timer_repository.stop_timer_session(timer_data.timer_id)
-        return TimerResponse.from_orm(stopped_timer)
+        stats_cache.invalidate_user(user_id)
+        return TimerSessionBulkImportResponse(imported=len(session_ids), session_ids=session_ids)
 
     async def get_active_timer(self, user_id: int) -> Optional[TimerResponse]:
-        """Get the currently active timer for a user"""
+        """Get the currently active timer for a user, from the registry when possible"""
+        found, response = active_timers.get(user_id)
+        if found:
+            return response
+
+        # Taken before the read: a change notified while it runs keeps the result out of the registry
+        version = active_timers.version(user_id)
         timer_session = await self.timer_repository.get_active_timer_for_user(user_id)
-        if timer_session:
-            return TimerResponse.from_orm(timer_session)
-        return None
+        response = TimerResponse.from_orm(timer_session) if timer_session else None
+        active_timers.set(user_id, response, version)
+        return response
+
+    async def get_users_with_auto_closed_timers(self, limit: int = 100) -> List[UserResponse]:
+        """Users the sweep closed a timer for who have not been told yet"""
+        users = await self.timer_repository.get_users_with_auto_closed_sessions(limit)
+        return [UserResponse.from_orm(user) for user in users]
+
+    async def report_auto_closed_timers(self, user_id: int) -> List[TimerResponse]:
+        """Timers the sweep closed since the user was last told, each returned once"""
+        timer_sessions = await self.timer_repository.report_auto_closed_sessions(user_id)
+        return [TimerResponse.from_orm(timer_session) for timer_session in timer_sessions]
 
     async def pause_timer(self, timer_id: int, user_id: int) -> Optional[TimerResponse]:
-        """Pause a timer (not implemented in this version)"""
-        # For now, we'll just return the timer as is
-        # In a future implementation, we could add a paused field to TimerSession
-        timer_session = await self.timer_repository.get(timer_id)
-        if not timer_session:
-            return None
+        """Pause a running timer"""
+        version = active_timers.version(user_id)
+        timer_session = await self.timer_repository.pause_timer_session(timer_id, user_id)
+        return self._segment_changed(user_id, timer_session, version)
 
-        task = await self.task_repository.get(timer_session.task_id)
-        if not task or task.user_id != user_id:
-            return None
+    async def resume_timer(self, timer_id: int, user_id: int) -> Optional[TimerResponse]:
+        """Resume a paused timer"""
+        version = active_timers.version(user_id)
+        timer_session = await self.timer_repository.resume_timer_session(timer_id, user_id)
+        return self._segment_changed(user_id, timer_session, version)
 
-        return TimerResponse.from_orm(timer_session)
\ No newline at end of file
+    def _segment_changed(self, user_id: int, timer_session, version) -> Optional[TimerResponse]:
+        if not timer_session:
+            return None
+        response = TimerResponse.from_orm(timer_session)
+        active_timers.set(user_id, response, version)
+        return response
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import settings
+from ..infrastructure.database.repositories.timer_repository import TimerRepository
+from ..infrastructure.cache.stats_cache import stats_cache
+from ..infrastructure.cache.active_timers import active_timers
+
+
+logger = logging.getLogger(__name__)
+
+
+class TimerSweeper:
+    """Background task that closes timers left running longer than their owner's limit"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self.session_factory = session_factory
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sweep(self) -> int:
+        """Close stale timers batch by batch, one transaction per batch; returns how many were closed"""
+        swept = 0
+        async with self.session_factory() as session:
+            timer_repository = TimerRepository(session)
+            while True:
+                stopped = await timer_repository.sweep_stale_sessions(
+                    default_limit=settings.max_timer_duration,
+                    min_limit=settings.min_max_timer_duration,
+                    batch_size=settings.timer_sweep_batch_size
+                )
+                for user_id in {timer_session.user_id for timer_session in stopped}:
+                    stats_cache.invalidate_user(user_id)
+                    active_timers.invalidate(user_id)
+
+                swept += len(stopped)
+                if len(stopped) < settings.timer_sweep_batch_size:
+                    break
+
+        if swept:
+            logger.info("Closed %s abandoned timer sessions", swept)
+        return swept
+
+    async def _run(self) -> None:
+        while self.running:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Error while sweeping abandoned timers")
+            await asyncio.sleep(settings.timer_sweep_interval)
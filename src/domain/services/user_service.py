@@ -1,18 +1,70 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..infrastructure.database.repositories.user_repository import UserRepository
+from ..infrastructure.database.repositories.daily_stats_repository import DailyStatsRepository
 from ..infrastructure.database.models import User
+from ..infrastructure.cache.stats_cache import stats_cache
 
 
 class UserService:
     def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
         self.user_repository = UserRepository(db_session)
+        self.daily_stats_repository = DailyStatsRepository(db_session)
 
-    async def get_or_create_user(self, telegram_id: str, username: Optional[str] = None) -> User:
+    async def get_or_create_user(
+        self,
+        telegram_id: str,
+        username: Optional[str] = None,
+        timezone: Optional[str] = None
+    ) -> User:
         """
         Get a user by telegram_id, or create a new one if they don't exist.
         """
         user = await self.user_repository.get_by_telegram_id(telegram_id)
         if not user:
-            user = await self.user_repository.create_user(telegram_id=str(telegram_id), username=username)
+            user = await self.user_repository.create_user(
+                telegram_id=str(telegram_id),
+                username=username,
+                timezone=timezone
+            )
+        return user
+
+    async def update_user(
+        self,
+        user_id: int,
+        username: Optional[str] = None,
+        timezone: Optional[str] = None,
+        max_timer_duration: Optional[int] = None
+    ) -> Optional[User]:
+        """
+        Update a user's profile with one UPDATE ... RETURNING. Changing the time
+        zone moves the day boundaries, so the user's statistics rollup is
+        rebuilt in the same transaction.
+        """
+        values = {}
+        if username is not None:
+            values['username'] = username
+        if max_timer_duration is not None:
+            values['max_timer_duration'] = max_timer_duration
+
+        updated = []
+        if timezone is not None:
+            # Only matches when the time zone actually changes
+            updated = await self.user_repository.update_returning(
+                User.id == user_id, User.timezone != timezone, timezone=timezone, **values
+            )
+        timezone_changed = bool(updated)
+        if timezone_changed:
+            await self.daily_stats_repository.rebuild(user_id)
+            user = updated[0]
+        else:
+            user = await self.user_repository.update(user_id, values)
+        if not user:
+            return None
+
+        await self.db_session.commit()
+
+        if timezone_changed:
+            stats_cache.invalidate_user(user_id)
         return user
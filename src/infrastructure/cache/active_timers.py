@@ -0,0 +1,87 @@
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import func, select, cast, String
+from sqlalchemy.dialects.postgresql import array
+from ...core.config import settings
+from .notifications import cache_notifications
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_TIMERS_CHANNEL = "active_timers"
+
+
+class ActiveTimerRegistry:
+    """
+    In-process map of user_id -> active timer (or None for "no active timer").
+
+    The durable source of truth is timer_sessions and its unique partial index
+    on (user_id) WHERE active. Every start/stop sends a NOTIFY on
+    ACTIVE_TIMERS_CHANNEL in its transaction; each API worker listens on that
+    channel and drops the user's entry, so workers never serve another
+    worker's stale timer for longer than it takes to deliver a notification.
+    Entries also expire after `ttl` seconds as a last resort.
+
+    Every invalidation bumps the user's version. Callers take `version()`
+    before reading the database and pass it to `set`, which ignores the value
+    if a notification arrived in between, since the read may predate it.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[Optional[Any], float]] = {}
+        self._versions: Dict[int, int] = {}
+        self._epoch = 0
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[Any]]:
+        """Return (found, timer); timer is None when the user has no active timer"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False, None
+
+        timer, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return False, None
+        return True, timer
+
+    def version(self, user_id: int) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(user_id, 0)
+
+    def set(self, user_id: int, timer: Optional[Any], version: Tuple[int, int]) -> None:
+        """Cache a value read at `version`, unless the user's timer changed since"""
+        if version != self.version(user_id):
+            return
+        self._entries[user_id] = (timer, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        """Forget everything, e.g. after missing notifications; reads in flight are not cached"""
+        self._entries.clear()
+        self._versions.clear()
+        self._epoch += 1
+
+    def on_notify(self, payload: str) -> None:
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %r", ACTIVE_TIMERS_CHANNEL, payload)
+
+
+def notify_active_timer_changed(user_id: int):
+    """Statement that tells every worker the user's active timer changed, delivered on commit"""
+    return select(func.pg_notify(ACTIVE_TIMERS_CHANNEL, str(user_id)))
+
+
+def notify_active_timers_changed(user_ids: Iterable[int]):
+    """One statement notifying every worker about several users at once"""
+    user_id = func.unnest(array(list(user_ids))).column_valued("user_id")
+    return select(func.pg_notify(ACTIVE_TIMERS_CHANNEL, cast(user_id, String)))
+
+
+active_timers = ActiveTimerRegistry(ttl=settings.active_timer_cache_ttl)
+cache_notifications.subscribe(ACTIVE_TIMERS_CHANNEL, active_timers.on_notify, on_reconnect=active_timers.clear)
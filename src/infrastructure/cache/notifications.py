@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationListener:
+    """
+    One dedicated connection per API worker that LISTENs on the cache
+    invalidation channels and hands each payload to the channel's handler.
+
+    Notifications sent while the connection is down are lost, so when it
+    drops every `on_reconnect` handler is called (to forget what it cached)
+    and the listener reconnects with exponential backoff, calling them again
+    once it is listening.
+    """
+
+    def __init__(self, retry_delay: float = 1.0, max_retry_delay: float = 30.0, check_interval: float = 30.0):
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.check_interval = check_interval
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._reconnect_handlers: List[Callable[[], None]] = []
+        self._connection: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, channel: str, handler: Callable[[str], None], on_reconnect: Callable[[], None]) -> None:
+        """Call `handler(payload)` for every notification on `channel`"""
+        self._handlers[channel] = handler
+        self._reconnect_handlers.append(on_reconnect)
+
+    def start(self, engine: AsyncEngine) -> None:
+        self._task = asyncio.create_task(self._run(engine))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._reset()
+
+    async def _run(self, engine: AsyncEngine) -> None:
+        delay = self.retry_delay
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._connection = await engine.connect()
+                raw_connection = (await self._connection.get_raw_connection()).driver_connection
+                raw_connection.add_termination_listener(lambda connection: lost.set())
+                for channel in self._handlers:
+                    await raw_connection.add_listener(channel, self._on_notify)
+                self._reset()
+                delay = self.retry_delay
+
+                while not lost.is_set() and not raw_connection.is_closed():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=self.check_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                logger.warning("Cache notification connection lost, reconnecting")
+            except asyncio.CancelledError:
+                await self._close()
+                raise
+            except Exception:
+                logger.exception("Cache notification listener failed, retrying in %ss", delay)
+
+            await self._close()
+            self._reset()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    async def _close(self) -> None:
+        if self._connection is not None:
+            try:
+                await self._connection.close()
+            except Exception:
+                logger.debug("Ignoring error while closing a lost notification connection", exc_info=True)
+            self._connection = None
+
+    def _reset(self) -> None:
+        for handler in self._reconnect_handlers:
+            handler()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        handler = self._handlers.get(channel)
+        if handler is not None:
+            handler(payload)
+
+
+cache_notifications = NotificationListener()
@@ -0,0 +1,128 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+from sqlalchemy import func, select, cast, String
+from sqlalchemy.dialects.postgresql import array
+from ...core.config import settings
+from .notifications import cache_notifications
+
+
+logger = logging.getLogger(__name__)
+
+
+StatsCacheKey = Tuple[int, str, Hashable]  # (user_id, endpoint, params)
+
+
+STATS_CHANNEL = "stats_changed"
+ALL_USERS = "*"
+
+
+class StatsCache:
+    """
+    Bounded in-process LRU cache for statistics responses.
+
+    Entries that include the current day live for `current_ttl` seconds,
+    entries that cover only finished days for `finished_ttl`. Everything
+    cached for a user is dropped by `invalidate_user` whenever one of their
+    tasks or timers changes: directly in the worker that made the change, and
+    in every other worker through a NOTIFY on STATS_CHANNEL sent in the
+    change's transaction.
+
+    Each invalidation bumps the user's generation. Callers take `generation()`
+    before computing a value and pass it to `set`, which drops the value if
+    the user's data changed while it was being computed.
+    """
+
+    def __init__(self, max_entries: int, current_ttl: float, finished_ttl: float):
+        self.max_entries = max_entries
+        self.current_ttl = current_ttl
+        self.finished_ttl = finished_ttl
+        self._entries: "OrderedDict[StatsCacheKey, Tuple[Any, float]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[StatsCacheKey]] = {}
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0
+
+    def get(self, key: StatsCacheKey) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def generation(self, user_id: int) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(user_id, 0)
+
+    def set(self, key: StatsCacheKey, value: Any, current: bool, generation: Tuple[int, int]) -> None:
+        """
+        Cache a value computed at `generation`, unless the user's data changed
+        since; `current` marks values that include today
+        """
+        if generation != self.generation(key[0]):
+            return
+
+        expires_at = time.monotonic() + (self.current_ttl if current else self.finished_ttl)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(key[0], set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached statistic of a user"""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        for key in self._keys_by_user.pop(user_id, set()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop everything; values being computed right now are not cached either"""
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self._generations.clear()
+        self._epoch += 1
+
+    def on_notify(self, payload: str) -> None:
+        if payload == ALL_USERS:
+            self.clear()
+            return
+        try:
+            self.invalidate_user(int(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %r", STATS_CHANNEL, payload)
+
+    def _remove(self, key: StatsCacheKey) -> None:
+        self._entries.pop(key, None)
+        user_keys = self._keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[key[0]]
+
+
+def notify_stats_changed(user_id: Optional[int] = None):
+    """Statement telling every worker a user's statistics (None: everybody's) changed, delivered on commit"""
+    payload = ALL_USERS if user_id is None else str(user_id)
+    return select(func.pg_notify(STATS_CHANNEL, payload))
+
+
+def notify_stats_changed_for(user_ids: Iterable[int]):
+    """One statement notifying every worker about several users' statistics at once"""
+    user_id = func.unnest(array(list(user_ids))).column_valued("user_id")
+    return select(func.pg_notify(STATS_CHANNEL, cast(user_id, String)))
+
+
+stats_cache = StatsCache(
+    max_entries=settings.stats_cache_max_entries,
+    current_ttl=settings.stats_cache_ttl,
+    finished_ttl=settings.stats_cache_finished_ttl
+)
+cache_notifications.subscribe(STATS_CHANNEL, stats_cache.on_notify, on_reconnect=stats_cache.clear)
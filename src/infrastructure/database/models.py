@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Table, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, ForeignKey, Table, Text, Index, Computed, text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 from .database import Base
@@ -10,7 +11,9 @@ task_tags = Table(
     'task_tags',
     Base.metadata,
     Column('task_id', Integer, ForeignKey('tasks.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('tag_id', Integer, ForeignKey('tags.id')),
+    # Tasks carrying a tag, for tag filters; covers (tag_id, task_id) so they never touch the heap
+    Index('ix_task_tags_tag_id_task_id', 'tag_id', 'task_id')
 )
 
 
@@ -20,11 +23,13 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     telegram_id = Column(String, unique=True, index=True)
     username = Column(String, nullable=True)
+    timezone = Column(String, nullable=False, default='UTC', server_default='UTC')  # IANA name, e.g. Europe/Moscow
+    max_timer_duration = Column(Integer, nullable=True)  # Seconds before a forgotten timer is closed; None = default
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    tasks = relationship("Task", back_populates="user")
-    tags = relationship("Tag", back_populates="user")
+    tasks = relationship("Task", back_populates="user", lazy="raise")
+    tags = relationship("Tag", back_populates="user", lazy="raise")
 
 
 class Tag(Base):
@@ -36,8 +41,8 @@ class Tag(Base):
     user_id = Column(Integer, ForeignKey('users.id'))
 
     # Relationship
-    user = relationship("User", back_populates="tags")
-    tasks = relationship("Task", secondary=task_tags, back_populates="tags")
+    user = relationship("User", back_populates="tags", lazy="raise")
+    tasks = relationship("Task", secondary=task_tags, back_populates="tags", lazy="raise")
 
 
 class Task(Base):
@@ -52,13 +57,39 @@ class Task(Base):
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
-    actual_time_spent = Column(Integer, default=0)  # Actual time spent in minutes
-
-    # Relationships
-    user = relationship("User", back_populates="tasks")
-    tags = relationship("Tag", secondary=task_tags, back_populates="tasks")
-    timer_sessions = relationship("TimerSession", back_populates="task")
-    completions = relationship("TaskCompletion", back_populates="task")
+    actual_time_spent = Column(Integer, default=0)  # Tracked time in seconds, added to on every timer stop
+    # Full-text document of title (weight A) and description (weight B), kept
+    # up to date by Postgres; the 'simple' configuration does no stemming, so
+    # it works the same for any language
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
+
+    # Relationships. None of them lazy-load: an AsyncSession cannot, so every
+    # query says what it needs (selectinload, contains_eager) and a forgotten
+    # one raises instead of becoming an N+1
+    user = relationship("User", back_populates="tasks", lazy="raise")
+    tags = relationship("Tag", secondary=task_tags, back_populates="tasks", lazy="raise")
+    timer_sessions = relationship("TimerSession", back_populates="task", lazy="raise")
+    completions = relationship(
+        "TaskCompletion", back_populates="task", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
+
+    __table_args__ = (
+        # Range scans over a user's tasks by creation / completion time; the
+        # trailing id makes (created_at, id) a unique keyset for task pages
+        Index('ix_tasks_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index(
+            'ix_tasks_user_id_completed_at', 'user_id', 'completed_at',
+            postgresql_where=text('completed_at IS NOT NULL')
+        ),
+        Index('ix_tasks_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
 
 class TimerSession(Base):
@@ -66,22 +97,83 @@ class TimerSession(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey('tasks.id'))
+    user_id = Column(Integer, ForeignKey('users.id'))  # Owner, denormalised from the task
     start_time = Column(DateTime(timezone=True))
     end_time = Column(DateTime(timezone=True), nullable=True)
-    duration = Column(Integer, nullable=True)  # Duration in minutes
+    duration = Column(Integer, nullable=True)  # Duration in seconds, excluding paused time
     active = Column(Boolean, default=True)
+    paused = Column(Boolean, nullable=False, default=False, server_default=text('false'))
+    # Run segments as flat [run, pause, run, pause, ...] offsets in seconds from
+    # start_time; an odd length means the last segment is still running
+    segments = Column(ARRAY(Integer), nullable=False, default=[0], server_default=text("'{0}'"))
+    elapsed = Column(Integer, nullable=False, default=0, server_default=text('0'))  # Seconds in closed segments
+    # Closed by the abandoned timer sweep, and whether the user has been told
+    auto_closed = Column(Boolean, nullable=False, default=False, server_default=text('false'))
+    auto_close_reported = Column(Boolean, nullable=False, default=False, server_default=text('false'))
 
     # Relationship
-    task = relationship("Task", back_populates="timer_sessions")
+    task = relationship("Task", back_populates="timer_sessions", lazy="raise")
+
+    __table_args__ = (
+        # Finished sessions of a task by end time
+        Index(
+            'ix_timer_sessions_task_id_end_time', 'task_id', 'end_time',
+            postgresql_where=text('active = false')
+        ),
+        # Finished sessions of a user by end time, for the heatmap and rollup rebuilds
+        Index(
+            'ix_timer_sessions_user_id_end_time', 'user_id', 'end_time',
+            postgresql_where=text('active = false')
+        ),
+        # Active timers by age, for the abandoned timer sweep
+        Index(
+            'ix_timer_sessions_start_time_active', 'start_time',
+            postgresql_where=text('active = true')
+        ),
+        # At most one active timer per user; also the active-timer lookup
+        Index(
+            'ix_timer_sessions_user_id_active', 'user_id',
+            unique=True,
+            postgresql_where=text('active = true')
+        ),
+        # Auto-closed sessions the user has not been told about yet
+        Index(
+            'ix_timer_sessions_user_id_auto_closed', 'user_id',
+            postgresql_where=text('auto_closed = true AND auto_close_reported = false')
+        ),
+    )
 
 
 class TaskCompletion(Base):
     __tablename__ = 'task_completions'
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey('tasks.id'))
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'))
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
-    actual_time_spent = Column(Integer)  # Time spent on this completion in minutes
+    actual_time_spent = Column(Integer)  # Time spent on this completion in seconds
 
     # Relationship
-    task = relationship("Task", back_populates="completions")
\ No newline at end of file
+    task = relationship("Task", back_populates="completions", lazy="raise")
+
+
+# Per-user daily rollup read by StatsService, maintained by DailyStatsRepository
+class UserDailyStats(Base):
+    __tablename__ = 'user_daily_stats'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    time_spent = Column(Integer, nullable=False, default=0)  # Tracked time in seconds
+    created_tasks = Column(Integer, nullable=False, default=0)  # Tasks created that day
+    active_tasks = Column(Integer, nullable=False, default=0)  # Tasks created that day and not completed yet
+    completed_tasks = Column(Integer, nullable=False, default=0)  # Tasks completed that day
+    planned_time = Column(Integer, nullable=False, default=0)  # Estimated time of tasks completed that day, in seconds
+
+
+
+# Per-task daily tracked time, used for tag statistics
+class TaskDailyStats(Base):
+    __tablename__ = 'task_daily_stats'
+
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    time_spent = Column(Integer, nullable=False, default=0)  # Tracked time in seconds
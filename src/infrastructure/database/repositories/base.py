@@ -1,6 +1,7 @@
 from typing import TypeVar, Generic, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import insert, update, delete
 from sqlalchemy.orm import sessionmaker
 from ..database.models import Base
 
@@ -19,35 +20,66 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        """Get all records with pagination"""
-        stmt = select(self.model).offset(skip).limit(limit)
+    async def get_all(self, limit: int = 100, after_id: Optional[int] = None) -> List[ModelType]:
+        """Get records in id order, `limit` at a time, starting after `after_id` (keyset pagination)"""
+        stmt = select(self.model).order_by(self.model.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
         result = await self.db_session.execute(stmt)
         return result.scalars().all()
 
+    async def insert_returning(self, values: dict) -> ModelType:
+        """INSERT ... RETURNING: add a record and get it back in one round trip, without committing"""
+        stmt = insert(self.model).values(**values).returning(self.model)
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one()
+
+    async def update_returning(self, *where, **values) -> List[ModelType]:
+        """
+        UPDATE ... RETURNING: change the records matching `where` and get them
+        back as updated, without committing. Put ownership checks in `where`,
+        so a record the caller may not touch is simply not returned.
+        """
+        stmt = (
+            update(self.model)
+            .where(*where)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def delete_returning(self, *where) -> List[ModelType]:
+        """DELETE ... RETURNING: remove the records matching `where` and get them back, without committing"""
+        stmt = (
+            delete(self.model)
+            .where(*where)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db_session.execute(stmt)
+        return list(result.scalars().all())
+
     async def create(self, obj_data: dict) -> ModelType:
         """Create a new record"""
-        db_obj = self.model(**obj_data)
-        self.db_session.add(db_obj)
+        db_obj = await self.insert_returning(obj_data)
         await self.db_session.commit()
-        await self.db_session.refresh(db_obj)
         return db_obj
 
-    async def update(self, id: int, obj_data: dict) -> Optional[ModelType]:
-        """Update a record by ID"""
-        db_obj = await self.get(id)
-        if db_obj:
-            for key, value in obj_data.items():
-                setattr(db_obj, key, value)
-            await self.db_session.commit()
-            await self.db_session.refresh(db_obj)
-        return db_obj
+    async def update(self, id: int, obj_data: dict, *where) -> Optional[ModelType]:
+        """Update a record by ID, if it also matches `where`"""
+        if not obj_data:
+            stmt = select(self.model).where(self.model.id == id, *where)
+            result = await self.db_session.execute(stmt)
+            return result.scalar_one_or_none()
 
-    async def delete(self, id: int) -> bool:
-        """Delete a record by ID"""
-        db_obj = await self.get(id)
-        if db_obj:
-            await self.db_session.delete(db_obj)
-            await self.db_session.commit()
-            return True
-        return False
\ No newline at end of file
+        updated = await self.update_returning(self.model.id == id, *where, **obj_data)
+        await self.db_session.commit()
+        return updated[0] if updated else None
+
+    async def delete(self, id: int, *where) -> bool:
+        """Delete a record by ID, if it also matches `where`"""
+        deleted = await self.delete_returning(self.model.id == id, *where)
+        await self.db_session.commit()
+        return bool(deleted)
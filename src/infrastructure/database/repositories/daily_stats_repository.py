@@ -0,0 +1,333 @@
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    func, select, delete, join, union_all, literal, literal_column, case, cast, extract, Integer, Date, DateTime
+)
+from sqlalchemy.dialects.postgresql import insert, Insert
+from .base import BaseRepository
+from ..models import UserDailyStats, TaskDailyStats, Task, TimerSession, User
+from ...cache.stats_cache import notify_stats_changed
+
+
+ROLLUP_COLUMNS = ("time_spent", "created_tasks", "active_tasks", "completed_tasks", "planned_time")
+ONE_DAY = literal_column("interval '1 day'")
+ONE_SECOND = literal_column("interval '1 second'")
+
+
+def local_date(column, timezone=User.timezone):
+    """The calendar date of a timestamptz column in the user's time zone"""
+    return func.date(func.timezone(timezone, column))
+
+
+def local_midnight(day, timezone=User.timezone):
+    """The instant a calendar day (a date or a date column) starts in the user's time zone"""
+    return func.timezone(timezone, cast(day, DateTime()))
+
+
+def day_range(column, start_date: Optional[date] = None, end_date: Optional[date] = None, timezone=User.timezone) -> list:
+    """
+    Predicates selecting rows whose local date(column) lies in [start_date, end_date].
+    Written as a half-open timestamp range on the bare column instead of
+    wrapping it in date(), so the (user_id, <column>) indexes can be used.
+    """
+    predicates = []
+    if start_date is not None:
+        predicates.append(column >= local_midnight(start_date, timezone))
+    if end_date is not None:
+        predicates.append(column < local_midnight(end_date + timedelta(days=1), timezone))
+    return predicates
+
+
+def run_segments(timer_session=TimerSession):
+    """
+    A FROM item yielding one row per closed run segment of a session, via
+    generate_series over its flat offsets array, and the segment's bounds.
+    Functions in FROM may refer to earlier FROM items, so it is listed
+    after timer_sessions.
+    """
+    segments = (
+        func.generate_series(1, func.array_length(timer_session.segments, 1) - 1, 2)
+        .table_valued("index")
+        .render_derived(name="segments")
+    )
+    segment_start = timer_session.start_time + timer_session.segments[segments.c.index] * ONE_SECOND
+    segment_end = timer_session.start_time + timer_session.segments[segments.c.index + 1] * ONE_SECOND
+    return segments, segment_start, segment_end
+
+
+def segment_days(timer_session=TimerSession, timezone=User.timezone):
+    """
+    FROM items splitting every closed run segment of a session at local
+    midnights, with (piece_start, piece_end, day) of each part
+    """
+    segments, segment_start, segment_end = run_segments(timer_session)
+    days = (
+        func.generate_series(local_date(segment_start, timezone), local_date(segment_end, timezone), ONE_DAY)
+        .table_valued("day")
+        .render_derived(name="days")
+    )
+    piece_start = func.greatest(segment_start, local_midnight(days.c.day, timezone))
+    piece_end = func.least(segment_end, local_midnight(days.c.day + ONE_DAY, timezone))
+    return (segments, days), piece_start, piece_end, days.c.day
+
+
+class DailyStatsRepository(BaseRepository[UserDailyStats]):
+    """
+    Maintains the user_daily_stats and task_daily_stats rollups.
+
+    Every write is an INSERT ... SELECT ... ON CONFLICT DO UPDATE that adds the
+    contribution of the affected rows, so the rollup is always updated in the
+    caller's transaction and never commits on its own.
+    """
+
+    def __init__(self, db_session: AsyncSession):
+        super().__init__(UserDailyStats, db_session)
+
+    async def add_sessions(self, session_ids: List[int]) -> None:
+        """Add the tracked time of finished timer sessions to the user and task rollups"""
+        if not session_ids:
+            return
+        for stmt in self.session_statements(TimerSession.__table__, TimerSession.id.in_(session_ids)):
+            await self.db_session.execute(stmt)
+
+    def session_statements(self, sessions, *where) -> Tuple[Insert, Insert]:
+        """
+        The user and task rollup upserts adding the tracked time of finished
+        sessions, unexecuted, so callers can run them as CTEs of a larger
+        statement. `sessions` is timer_sessions or anything with its columns,
+        like an UPDATE ... RETURNING CTE.
+        """
+        session_days = self._session_days(*where, sessions=sessions)
+        return (
+            self._upsert_statement(self._session_contributions(session_days)),
+            self._task_days_statement(session_days)
+        )
+
+    async def add_tasks(self, task_ids: List[int], *where, sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) the contribution of tasks, among those
+        also matching `where`, to the rollup. Callers remove the contribution
+        before changing a task and add it back afterwards, so the rollup
+        follows whatever the row ends up looking like.
+        """
+        if not task_ids:
+            return
+        await self._upsert(self._task_contributions(Task.id.in_(task_ids), *where, sign=sign))
+
+    async def rebuild(
+        self,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> None:
+        """
+        Recompute the rollup from tasks and timer sessions, for one user or
+        everybody, optionally limited to the days in [start_date, end_date].
+        Running API workers drop their cached statistics when it commits.
+        """
+        delete_user_days = delete(UserDailyStats)
+        delete_task_days = delete(TaskDailyStats)
+        task_owner, session_owner = [], []
+        if user_id is not None:
+            delete_user_days = delete_user_days.where(UserDailyStats.user_id == user_id)
+            delete_task_days = delete_task_days.where(
+                TaskDailyStats.task_id.in_(select(Task.id).where(Task.user_id == user_id))
+            )
+            task_owner.append(Task.user_id == user_id)
+            session_owner.append(TimerSession.user_id == user_id)
+        if start_date is not None:
+            delete_user_days = delete_user_days.where(UserDailyStats.day >= start_date)
+            delete_task_days = delete_task_days.where(TaskDailyStats.day >= start_date)
+        if end_date is not None:
+            delete_user_days = delete_user_days.where(UserDailyStats.day <= end_date)
+            delete_task_days = delete_task_days.where(TaskDailyStats.day <= end_date)
+
+        await self.db_session.execute(delete_user_days)
+        await self.db_session.execute(delete_task_days)
+
+        # Sessions overlapping the window only contribute their share of the window's days
+        session_days = self._session_days(
+            TimerSession.active == False, *session_owner, start_date=start_date, end_date=end_date
+        )
+        await self._upsert(
+            union_all(
+                self._task_contributions(*task_owner, start_date=start_date, end_date=end_date),
+                self._session_contributions(session_days)
+            )
+        )
+        await self.db_session.execute(self._task_days_statement(session_days))
+        await self.db_session.execute(notify_stats_changed(user_id))
+
+    def _task_contributions(self, *where, sign: int = 1, start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        Per-task rows: +1 created (and active) on the creation day, +1 completed
+        on the completion day. Days are calendar days in the owner's time zone.
+        """
+        created = (
+            select(
+                Task.user_id.label("user_id"),
+                local_date(Task.created_at).label("day"),
+                literal(0).label("time_spent"),
+                literal(sign).label("created_tasks"),
+                case((Task.completed == True, 0), else_=sign).label("active_tasks"),
+                literal(0).label("completed_tasks"),
+                literal(0).label("planned_time")
+            )
+            .join(User, Task.user_id == User.id)
+            .where(
+                Task.created_at.is_not(None),
+                *day_range(Task.created_at, start_date, end_date),
+                *where
+            )
+        )
+        completed = (
+            select(
+                Task.user_id.label("user_id"),
+                local_date(Task.completed_at).label("day"),
+                literal(0).label("time_spent"),
+                literal(0).label("created_tasks"),
+                literal(0).label("active_tasks"),
+                literal(sign).label("completed_tasks"),
+                # Estimates are entered in minutes, the rollup counts seconds
+                (func.coalesce(Task.estimated_time, 0) * 60 * sign).label("planned_time")
+            )
+            .join(User, Task.user_id == User.id)
+            .where(
+                Task.completed == True,
+                Task.completed_at.is_not(None),
+                *day_range(Task.completed_at, start_date, end_date),
+                *where
+            )
+        )
+        return union_all(created, completed)
+
+    def _session_days(
+        self,
+        *where,
+        sessions=TimerSession.__table__,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ):
+        """
+        Per-(session, local day) rows with the session's user and task; the
+        owner comes from timer_sessions.user_id, so sessions whose task was
+        deleted (task_id NULL) still count for their user. Each
+        run segment of a session is split at every local midnight it spans,
+        so paused time counts nowhere and 23:00-02:00 credits an hour to the
+        first day and two to the second. A piece's share is the difference of
+        floored cumulative fractions of the session's duration, so the shares
+        always add up to the duration.
+        """
+        columns = sessions.c
+        start, end = columns.start_time, columns.end_time
+        froms, piece_start, piece_end, day = segment_days(columns)
+        piece_seconds = extract('epoch', piece_end - piece_start)
+
+        window = []
+        if start_date is not None:
+            window.append(end >= local_midnight(start_date))
+        if end_date is not None:
+            window.append(start < local_midnight(end_date + timedelta(days=1)))
+
+        pieces = (
+            select(
+                columns.user_id.label("user_id"),
+                columns.task_id.label("task_id"),
+                cast(day, Date).label("day"),
+                func.coalesce(columns.duration, 0).label("duration"),
+                piece_seconds.label("seconds"),
+                func.sum(piece_seconds).over(partition_by=columns.id).label("total_seconds"),
+                func.sum(piece_seconds).over(
+                    partition_by=columns.id,
+                    order_by=piece_start,
+                    rows=(None, 0)
+                ).label("through_seconds")
+            )
+            .select_from(
+                join(sessions, User, columns.user_id == User.id),
+                *froms
+            )
+            .where(
+                start.is_not(None),
+                end.is_not(None),
+                *window,
+                *where
+            )
+            .subquery()
+        )
+
+        total = func.nullif(pieces.c.total_seconds, 0)
+        share = (
+            func.floor(pieces.c.duration * pieces.c.through_seconds / total)
+            - func.floor(pieces.c.duration * (pieces.c.through_seconds - pieces.c.seconds) / total)
+        )
+
+        days = []
+        if start_date is not None:
+            days.append(pieces.c.day >= start_date)
+        if end_date is not None:
+            days.append(pieces.c.day <= end_date)
+
+        return select(
+            pieces.c.user_id,
+            pieces.c.task_id,
+            pieces.c.day,
+            cast(func.coalesce(share, 0), Integer).label("time_spent")
+        ).where(*days)
+
+    def _session_contributions(self, session_days):
+        """Session rows shaped as user rollup contributions"""
+        rows = session_days.subquery()
+        return select(
+            rows.c.user_id,
+            rows.c.day,
+            rows.c.time_spent,
+            literal(0).label("created_tasks"),
+            literal(0).label("active_tasks"),
+            literal(0).label("completed_tasks"),
+            literal(0).label("planned_time")
+        )
+
+    def _task_days_statement(self, session_days) -> Insert:
+        """Sum session time per (task, day) and add it onto the task rollup"""
+        rows = session_days.subquery()
+        grouped = (
+            select(rows.c.task_id, rows.c.day, cast(func.sum(rows.c.time_spent), Integer).label("time_spent"))
+            .where(rows.c.task_id.is_not(None))
+            .group_by(rows.c.task_id, rows.c.day)
+        )
+
+        stmt = insert(TaskDailyStats).from_select(["task_id", "day", "time_spent"], grouped)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskDailyStats.task_id, TaskDailyStats.day],
+            set_={"time_spent": TaskDailyStats.time_spent + stmt.excluded.time_spent}
+        )
+        return stmt
+
+    async def _upsert(self, contributions) -> None:
+        """Add contributions onto the user rollup"""
+        await self.db_session.execute(self._upsert_statement(contributions))
+
+    def _upsert_statement(self, contributions) -> Insert:
+        """Sum contributions per (user, day) and add them onto the existing rollup rows"""
+        rows = contributions.subquery()
+        grouped = (
+            select(
+                rows.c.user_id,
+                rows.c.day,
+                *[cast(func.sum(rows.c[column]), Integer).label(column) for column in ROLLUP_COLUMNS]
+            )
+            .where(rows.c.user_id.is_not(None))
+            .group_by(rows.c.user_id, rows.c.day)
+        )
+
+        stmt = insert(UserDailyStats).from_select(["user_id", "day", *ROLLUP_COLUMNS], grouped)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserDailyStats.user_id, UserDailyStats.day],
+            set_={
+                column: getattr(UserDailyStats, column) + getattr(stmt.excluded, column)
+                for column in ROLLUP_COLUMNS
+            }
+        )
+        return stmt
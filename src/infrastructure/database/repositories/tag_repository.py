@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from .base import BaseRepository
 from ..models import Tag, User
+from ...cache.stats_cache import notify_stats_changed
 
 
 class TagRepository(BaseRepository[Tag]):
@@ -23,8 +24,8 @@ class TagRepository(BaseRepository[Tag]):
 
     async def create_tag_for_user(self, name: str, user_id: int, color: str = None) -> Tag:
         """Create a new tag for a specific user"""
-        tag = Tag(name=name, user_id=user_id, color=color)
-        self.db_session.add(tag)
+        tag = await self.insert_returning({"name": name, "user_id": user_id, "color": color})
+        # The new tag shows up in tag statistics
+        await self.db_session.execute(notify_stats_changed(user_id))
         await self.db_session.commit()
-        await self.db_session.refresh(tag)
         return tag
\ No newline at end of file
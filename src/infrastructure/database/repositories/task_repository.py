@@ -1,40 +1,126 @@
-from typing import List, Optional
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from sqlalchemy import insert, update, delete, case, tuple_, exists, distinct
 from .base import BaseRepository
+from .daily_stats_repository import DailyStatsRepository
+from .timer_repository import TimerRepository
 from sqlalchemy.orm import selectinload
-from ..models import Task, User, Tag, task_tags
-from ...domain.models.task import TaskCreate, TaskUpdate
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm.attributes import set_committed_value
+from ..models import Task, Tag, TaskCompletion, TimerSession, task_tags
+from ...cache.stats_cache import notify_stats_changed
+from ...domain.models.task import TaskCreate, TaskUpdate, TaskBulkUpdateItem
+
+
+# Words as to_tsvector('simple', ...) splits them
+WORD_RE = re.compile(r"[^\W_]+")
 
 
 class TaskRepository(BaseRepository[Task]):
     def __init__(self, db_session: AsyncSession):
         super().__init__(Task, db_session)
+        self.daily_stats_repository = DailyStatsRepository(db_session)
 
     async def get_filtered_tasks(
         self, 
         user_id: int, 
-        skip: int = 0, 
         limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
         completed: Optional[bool] = None,
         priority: Optional[int] = None,
+        min_priority: Optional[int] = None,
         tag_id_list: Optional[List[int]] = None,
+        tag_mode: str = "any",
         title_contains: Optional[str] = None,
         estimated_time_min: Optional[int] = None,
         estimated_time_max: Optional[int] = None,
     ) -> List[Task]:
-        """Get tasks for a user with comprehensive filtering and eager loading of tags."""
-        stmt = (
-            select(Task)
-            .where(Task.user_id == user_id)
-            .options(selectinload(Task.tags))
+        """
+        Get a page of a user's tasks, newest first, with comprehensive filtering
+        and eager loading of tags. Pages are keyed on (created_at, id): `after`
+        is the key of the previous page's last task, so every page is a range
+        scan on ix_tasks_user_id_created_at_id no matter how deep it is.
+        With tag_mode "any" a task needs one of tag_id_list, with "all" every one.
+        """
+        stmt = self._filtered_page(
+            select(Task).options(selectinload(Task.tags)),
+            user_id,
+            limit,
+            after,
+            completed=completed,
+            priority=priority,
+            min_priority=min_priority,
+            tag_id_list=tag_id_list,
+            tag_mode=tag_mode,
+            title_contains=title_contains,
+            estimated_time_min=estimated_time_min,
+            estimated_time_max=estimated_time_max,
+        )
+        result = await self.db_session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_task_summaries(
+        self,
+        user_id: int,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+        **filters
+    ) -> List[RowMapping]:
+        """
+        The same page as get_filtered_tasks, but only the columns list views
+        show, with tag names aggregated in SQL. Returns plain rows: no ORM
+        objects, identity map or tag relationship loading.
+        """
+        tag_names = (
+            select(func.array_agg(aggregate_order_by(Tag.name, Tag.name)))
+            .join(task_tags, task_tags.c.tag_id == Tag.id)
+            .where(task_tags.c.task_id == Task.id)
+            .scalar_subquery()
+        )
+        stmt = self._filtered_page(
+            select(Task.id, Task.title, Task.priority, Task.completed, Task.created_at, tag_names.label("tags")),
+            user_id,
+            limit,
+            after,
+            **filters
         )
+        result = await self.db_session.execute(stmt)
+        return result.mappings().all()
+
+    def _filtered_page(
+        self,
+        stmt,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        completed: Optional[bool] = None,
+        priority: Optional[int] = None,
+        min_priority: Optional[int] = None,
+        tag_id_list: Optional[List[int]] = None,
+        tag_mode: str = "any",
+        title_contains: Optional[str] = None,
+        estimated_time_min: Optional[int] = None,
+        estimated_time_max: Optional[int] = None,
+    ):
+        """Restrict a select over tasks to one keyset page of the user's filtered tasks"""
+        stmt = stmt.where(Task.user_id == user_id).order_by(Task.created_at.desc(), Task.id.desc())
+
+        if after is not None:
+            stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(*after))
         
         if completed is not None:
             stmt = stmt.where(Task.completed == completed)
         
         if priority is not None:
             stmt = stmt.where(Task.priority == priority)
+
+        if min_priority is not None:
+            stmt = stmt.where(Task.priority >= min_priority)
         
         if title_contains:
             stmt = stmt.where(Task.title.contains(title_contains))
@@ -46,70 +132,341 @@ class TaskRepository(BaseRepository[Task]):
             stmt = stmt.where(Task.estimated_time <= estimated_time_max)
         
         if tag_id_list:
-            stmt = stmt.join(task_tags).where(task_tags.c.tag_id.in_(tag_id_list))
+            stmt = stmt.where(self._tag_filter(tag_id_list, tag_mode))
 
-        stmt = stmt.offset(skip).limit(limit)
-        
-        result = await self.db_session.execute(stmt)
-        # Use .unique() to handle potential duplicates from the join
-        return result.scalars().unique().all()
-
-    async def get_task_with_details(self, task_id: int, user_id: int) -> Optional[Task]:
-        """Get a task with its tags and user info"""
-        stmt = select(Task).join(User).outerjoin(Task.tags).where(
-            Task.id == task_id, 
-            Task.user_id == user_id
+        return stmt.limit(limit)
+
+    @staticmethod
+    def _tag_filter(tag_id_list: List[int], tag_mode: str = "any"):
+        """
+        Semi-join predicate on Task for the tag filter. Unlike a join it never
+        repeats a task, so LIMIT counts distinct tasks and pages come back full.
+        Both forms are answered from ix_task_tags_tag_id_task_id.
+        """
+        tag_ids = set(tag_id_list)
+        if tag_mode == "all":
+            tagged_with_all = (
+                select(task_tags.c.task_id)
+                .where(task_tags.c.tag_id.in_(tag_ids))
+                .group_by(task_tags.c.task_id)
+                .having(func.count(distinct(task_tags.c.tag_id)) == len(tag_ids))
+            )
+            return Task.id.in_(tagged_with_all)
+        return exists().where(task_tags.c.task_id == Task.id, task_tags.c.tag_id.in_(tag_ids))
+
+    async def search_tasks(self, user_id: int, query: str, limit: int = 20) -> List[Task]:
+        """
+        A user's tasks matching every word of `query` as a prefix, in title or
+        description, best ranked first, from the GIN-indexed search_vector.
+        """
+        words = WORD_RE.findall(query.lower())
+        if not words:
+            return []
+
+        ts_query = func.to_tsquery('simple', ' & '.join(f"{word}:*" for word in words))
+        stmt = (
+            select(Task)
+            .where(Task.user_id == user_id, Task.search_vector.op('@@')(ts_query))
+            .options(selectinload(Task.tags))
+            .order_by(func.ts_rank_cd(Task.search_vector, ts_query).desc(), Task.created_at.desc(), Task.id.desc())
+            .limit(limit)
         )
         result = await self.db_session.execute(stmt)
-        return result.scalar_one_or_none()
+        return result.scalars().all()
+
+    async def get_task_with_details(
+        self,
+        task_id: int,
+        user_id: int,
+        recent_sessions: int = 0
+    ) -> Optional[Tuple[Task, int, List[TimerSession]]]:
+        """
+        Get one of the user's tasks with its tags, its number of finished timer
+        sessions and its latest `recent_sessions` finished sessions. Always a
+        fixed number of queries: the task with the count as a scalar subquery,
+        one selectinload for the tags, and one for the sessions if asked for.
+        """
+        session_count = (
+            select(func.count())
+            .where(TimerSession.task_id == Task.id, TimerSession.active == False)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(Task, session_count)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .options(selectinload(Task.tags))
+        )
+        row = (await self.db_session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        task, count = row
+
+        sessions = []
+        if recent_sessions and count:
+            stmt = (
+                select(TimerSession)
+                .where(TimerSession.task_id == task_id, TimerSession.active == False)
+                .order_by(TimerSession.end_time.desc())
+                .limit(recent_sessions)
+            )
+            sessions = list((await self.db_session.execute(stmt)).scalars().all())
+        return task, count, sessions
 
     async def create_task_with_tags(self, task_data: TaskCreate, user_id: int) -> Task:
         """Create a task and associate it with tags"""
-        # Prepare task data excluding tags
         task_dict = task_data.dict(exclude={'tags'})
         task_dict['user_id'] = user_id
-        
-        # Create the task
-        task = Task(**task_dict)
-        self.db_session.add(task)
-        await self.db_session.flush()  # Get the task ID without committing
-        
-        # Associate tags if provided
-        if task_data.tags:
-            # Get existing tags by IDs
-            tag_stmt = select(Tag).where(Tag.id.in_(task_data.tags), Tag.user_id == user_id)
-            tags_result = await self.db_session.execute(tag_stmt)
-            tags = tags_result.scalars().all()
-            task.tags.extend(tags)
-        
+        if task_dict.get('completed'):
+            task_dict['completed_at'] = func.now()
+
+        task = await self.insert_returning(task_dict)
+        await self.daily_stats_repository.add_tasks([task.id])
+        if task.completed:
+            await self.record_completions([task.id])
+
+        tags = await self._owned_tags(user_id, task_data.tags)
+        await self._insert_tags([{"task_id": task.id, "tag_id": tag.id} for tag in tags])
+        set_committed_value(task, 'tags', tags)
+
+        await self.db_session.execute(notify_stats_changed(user_id))
         await self.db_session.commit()
-        await self.db_session.refresh(task)
         return task
 
     async def update_task_with_tags(self, task_id: int, task_data: TaskUpdate, user_id: int) -> Optional[Task]:
-        """Update a task and its associated tags"""
-        task = await self.get(task_id)
-        if not task or task.user_id != user_id:
+        """
+        Update one of the user's tasks and its tags; None if the user does not
+        own it. The row is locked before its old state is taken out of the
+        rollup, so concurrent updates of the same task apply one after the other.
+        """
+        locked = await self.db_session.execute(
+            select(Task.completed).where(Task.id == task_id, Task.user_id == user_id).with_for_update()
+        )
+        completed_before = locked.scalar_one_or_none()
+        if completed_before is None:
+            await self.db_session.rollback()
             return None
-            
-        # Update task fields
-        update_data = task_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            if field != 'tags':  # Handle tags separately
-                setattr(task, field, value)
-        
-        # Update tags if provided
-        if 'tags' in update_data and task_data.tags is not None:
-            # Clear existing tags
-            task.tags.clear()
-            
-            # Add new tags if any
-            if task_data.tags:
-                tag_stmt = select(Tag).where(Tag.id.in_(task_data.tags), Tag.user_id == user_id)
-                tags_result = await self.db_session.execute(tag_stmt)
-                tags = tags_result.scalars().all()
-                task.tags.extend(tags)
-        
+
+        update_data = task_data.dict(exclude_unset=True, exclude={'tags'})
+        affects_stats = 'completed' in update_data or 'estimated_time' in update_data
+        if affects_stats:
+            # Take the task out of the daily rollup, it is added back below
+            await self.daily_stats_repository.add_tasks([task_id], sign=-1)
+
+        newly_completed = False
+        if 'completed' in update_data:
+            # Keep completed_at when the state does not actually change
+            if update_data['completed'] != completed_before:
+                update_data['completed_at'] = func.now() if update_data['completed'] else None
+                newly_completed = update_data['completed']
+
+        if update_data:
+            updated = await self.update_returning(Task.id == task_id, **update_data)
+        else:
+            stmt = select(Task).where(Task.id == task_id)
+            updated = (await self.db_session.execute(stmt)).scalars().all()
+        task = updated[0]
+
+        if affects_stats:
+            await self.daily_stats_repository.add_tasks([task_id])
+        if newly_completed:
+            await self.record_completions([task_id])
+
+        if task_data.tags is not None:
+            tags = (await self._replace_tags(user_id, {task_id: task_data.tags}))[task_id]
+        else:
+            tags = (await self.db_session.execute(
+                select(Tag).join(task_tags, task_tags.c.tag_id == Tag.id).where(task_tags.c.task_id == task_id)
+            )).scalars().all()
+        set_committed_value(task, 'tags', list(tags))
+
+        await self.db_session.execute(notify_stats_changed(user_id))
+        await self.db_session.commit()
+        return task
+
+    async def create_tasks(self, user_id: int, tasks_data: List[TaskCreate]) -> List[Task]:
+        """
+        Create many tasks in one transaction: the tasks go in as multi-row
+        INSERT ... RETURNING batches, tag associations as one executemany, and
+        rollups and completions are updated set-based. Tag IDs the user does
+        not own are ignored, as in create_task_with_tags.
+        """
+        owned_tags = {tag.id for tag in await self._owned_tags(user_id, [tag_id for task in tasks_data for tag_id in task.tags])}
+        now = datetime.now(timezone.utc)
+        rows = []
+        for task_data in tasks_data:
+            row = task_data.dict(exclude={'tags'})
+            row['user_id'] = user_id
+            row['completed_at'] = now if task_data.completed else None
+            rows.append(row)
+
+        result = await self.db_session.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        )
+        task_ids = list(result.scalars().all())
+
+        await self._insert_tags([
+            {"task_id": task_id, "tag_id": tag_id}
+            for task_id, task_data in zip(task_ids, tasks_data)
+            for tag_id in dict.fromkeys(task_data.tags) if tag_id in owned_tags
+        ])
+        await self.daily_stats_repository.add_tasks(task_ids)
+        await self.record_completions([
+            task_id for task_id, task_data in zip(task_ids, tasks_data) if task_data.completed
+        ])
+        await self.db_session.execute(notify_stats_changed(user_id))
+        await self.db_session.commit()
+        return await self._get_tasks_in_order(task_ids)
+
+    async def update_tasks(self, user_id: int, updates: List[TaskBulkUpdateItem]) -> Optional[List[Task]]:
+        """
+        Apply many partial updates in one transaction, all or nothing. Ownership
+        of every task is checked with one locking query, the rows are written with one
+        executemany UPDATE by primary key per distinct set of fields, and tags
+        are replaced with one DELETE and one executemany INSERT. Returns None if
+        any task does not belong to the user.
+        """
+        task_ids = [item.id for item in updates]
+        # Lock the rows (in ID order, so concurrent batches cannot deadlock)
+        # before their completion state is read and their rollup is rewritten
+        owned = await self.db_session.execute(
+            select(Task.id, Task.completed)
+            .where(Task.id.in_(task_ids), Task.user_id == user_id)
+            .order_by(Task.id)
+            .with_for_update()
+        )
+        completed_before: Dict[int, bool] = dict(owned.all())
+        if len(completed_before) != len(task_ids):
+            await self.db_session.rollback()
+            return None
+
+        now = datetime.now(timezone.utc)
+        rows, stats_ids, newly_completed, retagged = [], [], [], {}
+        for item in updates:
+            values = item.dict(exclude_unset=True, exclude={'tags'})
+            if 'completed' in values or 'estimated_time' in values:
+                stats_ids.append(item.id)
+            if 'completed' in values and values['completed'] != completed_before[item.id]:
+                values['completed_at'] = now if values['completed'] else None
+                if values['completed']:
+                    newly_completed.append(item.id)
+            if len(values) > 1:
+                rows.append(values)
+            if item.tags is not None:
+                retagged[item.id] = item.tags
+
+        # Take changed tasks out of the daily rollup, they are added back below
+        await self.daily_stats_repository.add_tasks(stats_ids, sign=-1)
+        if rows:
+            await self.db_session.execute(update(Task), rows)
+        await self.daily_stats_repository.add_tasks(stats_ids)
+        await self.record_completions(newly_completed)
+
+        if retagged:
+            await self._replace_tags(user_id, retagged)
+
+        await self.db_session.execute(notify_stats_changed(user_id))
+        await self.db_session.commit()
+        return await self._get_tasks_in_order(task_ids)
+
+    async def delete_tasks(self, user_id: int, task_ids: List[int]) -> Optional[List[int]]:
+        """
+        Delete many tasks in one transaction, all or nothing, with one
+        set-based statement per table. Returns None if any task does not
+        belong to the user.
+        """
+        deleted = await self._delete_tasks(task_ids, Task.user_id == user_id)
+        if len(deleted) != len(task_ids):
+            await self.db_session.rollback()
+            return None
+        await self.db_session.execute(notify_stats_changed(user_id))
         await self.db_session.commit()
-        await self.db_session.refresh(task)
-        return task
\ No newline at end of file
+        return deleted
+
+    async def _delete_tasks(self, task_ids: List[int], *where) -> List[int]:
+        """
+        Delete the tasks among task_ids that match `where`, without committing,
+        and return their IDs. Their tag associations go with them; a running
+        timer on one of them is stopped first, and their timer sessions are
+        kept and detached, still counting for their user.
+        """
+        matching = select(Task.id).where(Task.id.in_(task_ids), *where)
+        await TimerRepository(self.db_session).stop_task_sessions(matching)
+        await self.daily_stats_repository.add_tasks(task_ids, *where, sign=-1)
+        await self.db_session.execute(delete(task_tags).where(task_tags.c.task_id.in_(matching)))
+        await self.db_session.execute(
+            update(TimerSession).where(TimerSession.task_id.in_(matching)).values(task_id=None)
+        )
+        deleted = await self.delete_returning(Task.id.in_(task_ids), *where)
+        return [task.id for task in deleted]
+
+    async def _owned_tags(self, user_id: int, tag_ids: List[int]) -> List[Tag]:
+        """The tags among tag_ids that belong to the user, in one query"""
+        if not tag_ids:
+            return []
+        result = await self.db_session.execute(
+            select(Tag).where(Tag.id.in_(set(tag_ids)), Tag.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
+    async def _replace_tags(self, user_id: int, tags_by_task: Dict[int, List[int]]) -> Dict[int, List[Tag]]:
+        """
+        Make each task's tags the user's tags among the requested IDs, writing
+        only the difference: one DELETE of the dropped (task, tag) pairs and one
+        executemany INSERT of the new ones, so unchanged tags cost nothing.
+        Returns the resulting tags of each task.
+        """
+        owned = {
+            tag.id: tag
+            for tag in await self._owned_tags(user_id, [tag_id for tag_ids in tags_by_task.values() for tag_id in tag_ids])
+        }
+        wanted = {
+            (task_id, tag_id)
+            for task_id, tag_ids in tags_by_task.items()
+            for tag_id in tag_ids if tag_id in owned
+        }
+        result = await self.db_session.execute(
+            select(task_tags.c.task_id, task_tags.c.tag_id).where(task_tags.c.task_id.in_(list(tags_by_task)))
+        )
+        current = {tuple(row) for row in result}
+
+        removed = current - wanted
+        if removed:
+            await self.db_session.execute(
+                delete(task_tags).where(tuple_(task_tags.c.task_id, task_tags.c.tag_id).in_(list(removed)))
+            )
+        await self._insert_tags([{"task_id": task_id, "tag_id": tag_id} for task_id, tag_id in sorted(wanted - current)])
+
+        return {
+            task_id: [owned[tag_id] for tag_id in dict.fromkeys(tag_ids) if tag_id in owned]
+            for task_id, tag_ids in tags_by_task.items()
+        }
+
+    async def _insert_tags(self, rows: List[dict]) -> None:
+        """Write (task_id, tag_id) associations with one executemany"""
+        if rows:
+            await self.db_session.execute(insert(task_tags), rows)
+
+    async def _get_tasks_in_order(self, task_ids: List[int]) -> List[Task]:
+        """Load tasks with their tags, in the order of task_ids"""
+        stmt = select(Task).where(Task.id.in_(task_ids)).options(selectinload(Task.tags))
+        tasks = {task.id: task for task in (await self.db_session.execute(stmt)).scalars()}
+        return [tasks[task_id] for task_id in task_ids if task_id in tasks]
+
+    async def record_completions(self, task_ids: List[int], *where) -> None:
+        """
+        Record a TaskCompletion for each task (among those matching `where`)
+        with the time tracked since its previous completion, taken from its
+        running actual_time_spent counter
+        """
+        if not task_ids:
+            return
+        previous = (
+            select(func.coalesce(func.sum(TaskCompletion.actual_time_spent), 0))
+            .where(TaskCompletion.task_id == Task.id)
+            .scalar_subquery()
+        )
+        stmt = insert(TaskCompletion).from_select(
+            ["task_id", "actual_time_spent"],
+            select(Task.id, func.coalesce(Task.actual_time_spent, 0) - previous).where(Task.id.in_(task_ids), *where)
+        )
+        await self.db_session.execute(stmt)
@@ -1,10 +1,14 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from datetime import datetime
+from sqlalchemy import func, insert, update, literal, case, cast, extract, Integer
+from sqlalchemy.exc import IntegrityError
 from .base import BaseRepository
-from ..models import TimerSession, Task
-from ...domain.models.timer import TimerStart, TimerStop
+from .daily_stats_repository import DailyStatsRepository, ONE_SECOND
+from ...cache.active_timers import notify_active_timer_changed, notify_active_timers_changed
+from ...cache.stats_cache import notify_stats_changed, notify_stats_changed_for
+from ..models import TimerSession, Task, User
+from ...domain.models.timer import TimerStart, TimerStop, TimerSessionImport
 
 
 class TimerRepository(BaseRepository[TimerSession]):
@@ -12,14 +16,10 @@ class TimerRepository(BaseRepository[TimerSession]):
         super().__init__(TimerSession, db_session)
 
     async def get_active_timer_for_user(self, user_id: int) -> Optional[TimerSession]:
-        """Get the currently active timer session for a user"""
-        stmt = (
-            select(TimerSession)
-            .join(Task)
-            .where(
-                TimerSession.active == True,
-                Task.user_id == user_id
-            )
+        """Get the currently active timer session for a user (a single-row index lookup)"""
+        stmt = select(TimerSession).where(
+            TimerSession.user_id == user_id,
+            TimerSession.active == True
         )
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
@@ -33,28 +33,320 @@ class TimerRepository(BaseRepository[TimerSession]):
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def create_timer_session(self, task_id: int) -> TimerSession:
-        """Create a new timer session for a task"""
-        timer_session = TimerSession(
-            task_id=task_id,
-            start_time=datetime.utcnow(),
-            active=True
+    async def start_timer_session(self, task_id: int, user_id: int) -> Optional[TimerSession]:
+        """
+        Stop the user's active timer (if any) and start a new one on one of the
+        user's tasks, in one statement, one notification SELECT and the commit.
+        The statement is an INSERT ... SELECT ... RETURNING with the stop
+        (UPDATE ... RETURNING), the task counter UPDATE and both rollup upserts
+        as CTEs reading the stopped session. Returns None, changing nothing, if
+        the task does not belong to the user. A concurrent start for the same
+        user trips the unique (user_id) WHERE active index and raises
+        IntegrityError after the transaction is rolled back.
+        """
+        owned_task = select(Task.id).where(Task.id == task_id, Task.user_id == user_id)
+        stopped = (
+            update(TimerSession)
+            .where(TimerSession.active == True, TimerSession.user_id == user_id, owned_task.exists())
+            .values(**self._stop_values())
+            .returning(
+                TimerSession.id, TimerSession.user_id, TimerSession.task_id, TimerSession.start_time,
+                TimerSession.end_time, TimerSession.duration, TimerSession.segments
+            )
+            .cte("stopped")
         )
-        self.db_session.add(timer_session)
-        await self.db_session.commit()
-        await self.db_session.refresh(timer_session)
-        return timer_session
+        # A scalar subquery runs before the first row is inserted, so the old
+        # timer is already stopped when the new one enters the active index
+        stopped_count = select(func.count()).select_from(stopped).scalar_subquery()
+        stmt = (
+            insert(TimerSession)
+            .from_select(
+                ["task_id", "user_id", "start_time", "active"],
+                select(Task.id, Task.user_id, func.now(), literal(True))
+                .where(Task.id == task_id, Task.user_id == user_id, stopped_count >= 0)
+            )
+            .add_cte(
+                self._task_time_statement(stopped).cte("counted"),
+                *[
+                    rollup.cte(name)
+                    for rollup, name in zip(
+                        DailyStatsRepository(self.db_session).session_statements(stopped),
+                        ("user_days", "task_days")
+                    )
+                ]
+            )
+            .returning(TimerSession, stopped_count)
+        )
+        try:
+            row = (await self.db_session.execute(stmt)).one_or_none()
+            if row is None:
+                await self.db_session.rollback()
+                return None
+            timer_session, stopped_sessions = row
 
-    async def stop_timer_session(self, timer_id: int) -> Optional[TimerSession]:
-        """Stop a timer session and calculate duration"""
-        timer_session = await self.get(timer_id)
-        if timer_session and timer_session.active:
-            timer_session.end_time = datetime.utcnow()
-            timer_session.active = False
-            # Calculate duration in minutes
-            duration = (timer_session.end_time - timer_session.start_time).total_seconds() / 60
-            timer_session.duration = round(duration)
-            
+            notifications = [notify_active_timer_changed(user_id)]
+            if stopped_sessions:
+                notifications.append(notify_stats_changed(user_id))
+            # Both pg_notify calls in one SELECT
+            await self.db_session.execute(
+                select(*[column for notify in notifications for column in notify.selected_columns])
+            )
             await self.db_session.commit()
-            await self.db_session.refresh(timer_session)
-        return timer_session
\ No newline at end of file
+        except IntegrityError:
+            await self.db_session.rollback()
+            raise
+        return timer_session
+
+    async def stop_timer_session(self, timer_id: int, user_id: int) -> Optional[TimerSession]:
+        """
+        Stop one of the user's timer sessions with a single UPDATE ... RETURNING
+        and roll it into the statistics in the same transaction. An already
+        stopped session is returned unchanged; None if the user does not own it.
+        """
+        stopped = await self._stop_sessions(TimerSession.id == timer_id, TimerSession.user_id == user_id)
+        if not stopped:
+            await self.db_session.rollback()
+            stmt = select(TimerSession).where(TimerSession.id == timer_id, TimerSession.user_id == user_id)
+            result = await self.db_session.execute(stmt)
+            return result.scalar_one_or_none()
+
+        await self._add_to_tasks([stopped[0].id])
+        await DailyStatsRepository(self.db_session).add_sessions([stopped[0].id])
+        await self.db_session.execute(notify_active_timer_changed(user_id))
+        await self.db_session.execute(notify_stats_changed(user_id))
+        await self.db_session.commit()
+        return stopped[0]
+
+    async def import_sessions(self, user_id: int, sessions: List[TimerSessionImport]) -> Optional[List[int]]:
+        """
+        Insert finished sessions in bulk, all or nothing. Ownership of every
+        referenced task is checked with one query, the rows go in as multi-row
+        INSERT ... RETURNING batches, and task counters and rollups are updated
+        with one set-based statement each, all in one transaction. Returns None
+        if any task does not belong to the user.
+        """
+        task_ids = {session.task_id for session in sessions}
+        owned = await self.db_session.execute(
+            select(Task.id).where(Task.id.in_(task_ids), Task.user_id == user_id)
+        )
+        if len(owned.scalars().all()) != len(task_ids):
+            return None
+
+        rows = []
+        for session in sessions:
+            seconds = round((session.end_time - session.start_time).total_seconds())
+            rows.append({
+                "task_id": session.task_id,
+                "user_id": user_id,
+                "start_time": session.start_time,
+                "end_time": session.end_time,
+                "active": False,
+                "paused": False,
+                "segments": [0, seconds],
+                "elapsed": seconds,
+                "duration": seconds
+            })
+
+        result = await self.db_session.execute(
+            insert(TimerSession).returning(TimerSession.id, sort_by_parameter_order=True), rows
+        )
+        session_ids = list(result.scalars().all())
+
+        await self._add_to_tasks(session_ids)
+        await DailyStatsRepository(self.db_session).add_sessions(session_ids)
+        await self.db_session.execute(notify_stats_changed(user_id))
+        await self.db_session.commit()
+        return session_ids
+
+    async def sweep_stale_sessions(self, default_limit: int, min_limit: int, batch_size: int) -> List[TimerSession]:
+        """
+        Close up to `batch_size` active sessions that ran longer than their
+        owner's limit, capping them at that limit, with one UPDATE ... RETURNING.
+        The min_limit bound is a plain range on the partial (start_time) WHERE
+        active index, so the sweep only reads sessions that are old enough to
+        be stale. SKIP LOCKED lets several workers sweep side by side.
+        """
+        limit = func.coalesce(User.max_timer_duration, default_limit)
+        stale = (
+            select(TimerSession.id)
+            .join(User, TimerSession.user_id == User.id)
+            .where(
+                TimerSession.active == True,
+                TimerSession.start_time < func.now() - ONE_SECOND * min_limit,
+                TimerSession.start_time < func.now() - ONE_SECOND * limit
+            )
+            .order_by(TimerSession.start_time)
+            .limit(batch_size)
+            .with_for_update(of=TimerSession, skip_locked=True)
+        )
+        stopped = await self._stop_sessions(
+            TimerSession.id.in_(stale),
+            TimerSession.user_id == User.id,
+            end_offset=func.greatest(limit, last_offset()),
+            auto_closed=True
+        )
+        if not stopped:
+            await self.db_session.rollback()
+            return []
+
+        session_ids = [session.id for session in stopped]
+        await self._add_to_tasks(session_ids)
+        await DailyStatsRepository(self.db_session).add_sessions(session_ids)
+        user_ids = {session.user_id for session in stopped}
+        await self.db_session.execute(notify_active_timers_changed(user_ids))
+        await self.db_session.execute(notify_stats_changed_for(user_ids))
+        await self.db_session.commit()
+        return stopped
+
+    async def get_users_with_auto_closed_sessions(self, limit: int = 100) -> List[User]:
+        """Users with auto-closed sessions not reported yet, read from the partial (user_id) index"""
+        pending = select(TimerSession.user_id).where(
+            TimerSession.auto_closed == True,
+            TimerSession.auto_close_reported == False
+        )
+        stmt = select(User).where(User.id.in_(pending)).order_by(User.id).limit(limit)
+        result = await self.db_session.execute(stmt)
+        return result.scalars().all()
+
+    async def report_auto_closed_sessions(self, user_id: int) -> List[TimerSession]:
+        """
+        Mark the user's auto-closed sessions as reported and return the ones
+        that were not yet, so each is reported once
+        """
+        reported = await self.update_returning(
+            TimerSession.user_id == user_id,
+            TimerSession.auto_closed == True,
+            TimerSession.auto_close_reported == False,
+            auto_close_reported=True
+        )
+        await self.db_session.commit()
+        return reported
+
+    async def stop_task_sessions(self, task_ids) -> List[TimerSession]:
+        """
+        End the active sessions of the given tasks (a list or a select of IDs)
+        and roll them into the user statistics, without committing; used
+        before the tasks are deleted
+        """
+        stopped = await self._stop_sessions(TimerSession.task_id.in_(task_ids))
+        if stopped:
+            user_ids = {session.user_id for session in stopped}
+            await DailyStatsRepository(self.db_session).add_sessions([session.id for session in stopped])
+            await self.db_session.execute(notify_active_timers_changed(user_ids))
+        return stopped
+
+    async def pause_timer_session(self, timer_id: int, user_id: int) -> Optional[TimerSession]:
+        """
+        Close the running segment of one of the user's active timers. The
+        segment's length is added onto `elapsed`, so the duration never needs
+        the segment list to be rescanned.
+        """
+        return await self._change_segments(
+            timer_id,
+            user_id,
+            TimerSession.paused == False,
+            paused=True,
+            segments=func.array_append(TimerSession.segments, now_offset()),
+            elapsed=TimerSession.elapsed + now_offset() - last_offset()
+        )
+
+    async def resume_timer_session(self, timer_id: int, user_id: int) -> Optional[TimerSession]:
+        """Open a new running segment on one of the user's paused timers"""
+        return await self._change_segments(
+            timer_id,
+            user_id,
+            TimerSession.paused == True,
+            paused=False,
+            segments=func.array_append(TimerSession.segments, now_offset())
+        )
+
+    async def _change_segments(self, timer_id: int, user_id: int, *where, **values) -> Optional[TimerSession]:
+        """Apply a pause/resume UPDATE ... RETURNING; None if the timer is not in the expected state"""
+        changed = await self.update_returning(
+            TimerSession.id == timer_id,
+            TimerSession.user_id == user_id,
+            TimerSession.active == True,
+            *where,
+            **values
+        )
+        if not changed:
+            await self.db_session.rollback()
+            return None
+
+        await self.db_session.execute(notify_active_timer_changed(user_id))
+        await self.db_session.commit()
+        return changed[0]
+
+    async def _add_to_tasks(self, session_ids: List[int]) -> None:
+        """Add the duration of finished sessions onto their tasks' actual_time_spent in one UPDATE"""
+        if not session_ids:
+            return
+        await self.db_session.execute(
+            self._task_time_statement(TimerSession.__table__, TimerSession.id.in_(session_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _task_time_statement(self, sessions, *where):
+        """
+        The UPDATE adding the duration of finished sessions onto their tasks'
+        actual_time_spent; `sessions` is timer_sessions or a CTE with its columns
+        """
+        session_time = (
+            select(sessions.c.task_id, func.sum(sessions.c.duration).label("duration"))
+            .where(*where)
+            .group_by(sessions.c.task_id)
+            .subquery()
+        )
+        return (
+            update(Task)
+            .where(Task.id == session_time.c.task_id)
+            .values(actual_time_spent=func.coalesce(Task.actual_time_spent, 0) + session_time.c.duration)
+        )
+
+    async def _stop_sessions(self, *where, end_offset=None, **values) -> List[TimerSession]:
+        """
+        End matching active sessions, also setting `values`, and return them.
+        They end at the transaction's now(), or `end_offset` seconds after
+        their start.
+        """
+        return await self.update_returning(
+            TimerSession.active == True,
+            *where,
+            **self._stop_values(end_offset),
+            **values
+        )
+
+    def _stop_values(self, end_offset=None) -> dict:
+        """The column values that end an active session"""
+        if end_offset is None:
+            end_offset, end_time = now_offset(), func.now()
+        else:
+            end_time = TimerSession.start_time + ONE_SECOND * end_offset
+
+        running = TimerSession.paused == False
+        elapsed = case(
+            (running, TimerSession.elapsed + end_offset - last_offset()),
+            else_=TimerSession.elapsed
+        )
+        return dict(
+            end_time=end_time,
+            active=False,
+            paused=False,
+            segments=case(
+                (running, func.array_append(TimerSession.segments, end_offset)),
+                else_=TimerSession.segments
+            ),
+            elapsed=elapsed,
+            # Exact seconds excluding paused time; rounding is left to presentation
+            duration=elapsed
+        )
+
+
+def now_offset():
+    """Seconds from the session's start to the transaction's now()"""
+    return cast(func.round(extract('epoch', func.now() - TimerSession.start_time)), Integer)
+
+
+def last_offset():
+    """The offset at which the session's latest segment started (or paused)"""
+    return TimerSession.segments[func.array_length(TimerSession.segments, 1)]
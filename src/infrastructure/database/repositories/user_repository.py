@@ -15,10 +15,17 @@ class UserRepository(BaseRepository[User]):
         result = await self.db_session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def create_user(self, telegram_id: str, username: Optional[str] = None) -> User:
+    async def get_timezone(self, user_id: int) -> str:
+        """Get a user's time zone name, UTC if the user is unknown"""
+        stmt = select(User.timezone).where(User.id == user_id)
+        result = await self.db_session.execute(stmt)
+        return result.scalar_one_or_none() or "UTC"
+
+    async def create_user(
+        self,
+        telegram_id: str,
+        username: Optional[str] = None,
+        timezone: Optional[str] = None
+    ) -> User:
         """Create a new user"""
-        new_user = User(telegram_id=telegram_id, username=username)
-        self.db_session.add(new_user)
-        await self.db_session.commit()
-        await self.db_session.refresh(new_user)
-        return new_user
+        return await self.create({"telegram_id": telegram_id, "username": username, "timezone": timezone or "UTC"})
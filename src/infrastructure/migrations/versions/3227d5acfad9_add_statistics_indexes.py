@@ -0,0 +1,63 @@
+"""add composite and partial indexes for statistics queries
+
+Revision ID: 3227d5acfad9
+Revises: f2d1801c4e7f
+Create Date: 2026-10-18 10:00:00.000000
+
+The statistics queries select a user's tasks and finished timer sessions by
+day. They now do that with half-open timestamp ranges on the bare columns
+(see daily_stats_repository.day_range) instead of date(column) = :day, which
+no index can serve, and these indexes match those predicates.
+
+Measuring
+---------
+No before/after plans have been measured for this migration yet. To
+measure, seed a database, then run these before and after `alembic upgrade`
+and record the output here:
+
+    EXPLAIN (ANALYZE, BUFFERS)
+    SELECT count(*) FROM tasks
+    WHERE user_id = :user_id AND completed
+      AND completed_at >= :day::timestamptz
+      AND completed_at < (:day + 1)::timestamptz;
+
+    EXPLAIN (ANALYZE, BUFFERS)
+    SELECT sum(timer_sessions.duration)
+    FROM timer_sessions JOIN tasks ON timer_sessions.task_id = tasks.id
+    WHERE tasks.user_id = :user_id AND NOT timer_sessions.active
+      AND timer_sessions.end_time >= :day::timestamptz
+      AND timer_sessions.end_time < (:day + 1)::timestamptz;
+
+The predicates they should exercise are (user_id, completed_at) on
+ix_tasks_user_id_completed_at, and (task_id, end_time) WHERE NOT active on
+ix_timer_sessions_task_id_end_time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3227d5acfad9'
+down_revision: Union[str, None] = 'f2d1801c4e7f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at'], unique=False)
+    op.create_index(
+        'ix_tasks_user_id_completed_at', 'tasks', ['user_id', 'completed_at'], unique=False,
+        postgresql_where=sa.text('completed_at IS NOT NULL')
+    )
+    op.create_index(
+        'ix_timer_sessions_task_id_end_time', 'timer_sessions', ['task_id', 'end_time'], unique=False,
+        postgresql_where=sa.text('active = false')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timer_sessions_task_id_end_time', table_name='timer_sessions')
+    op.drop_index('ix_tasks_user_id_completed_at', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_created_at', table_name='tasks')
@@ -0,0 +1,55 @@
+"""backfill tasks.actual_time_spent and task_completions
+
+Revision ID: 4f6b2d8e9a1c
+Revises: e1a7d4c9f2b8
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6b2d8e9a1c'
+down_revision: Union[str, None] = 'e1a7d4c9f2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # From here on the counter is only ever incremented, so start it from the sessions
+    op.execute(
+        """
+        UPDATE tasks
+        SET actual_time_spent = coalesce((
+            SELECT sum(duration)
+            FROM timer_sessions
+            WHERE timer_sessions.task_id = tasks.id AND timer_sessions.active = false
+        ), 0)
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO task_completions (task_id, completed_at, actual_time_spent)
+        SELECT tasks.id, coalesce(tasks.completed_at, now()), tasks.actual_time_spent
+        FROM tasks
+        WHERE tasks.completed
+          AND NOT EXISTS (SELECT 1 FROM task_completions WHERE task_completions.task_id = tasks.id)
+        """
+    )
+
+    op.drop_constraint('task_completions_task_id_fkey', 'task_completions', type_='foreignkey')
+    op.create_foreign_key(
+        'task_completions_task_id_fkey', 'task_completions', 'tasks',
+        ['task_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('task_completions_task_id_fkey', 'task_completions', type_='foreignkey')
+    op.create_foreign_key(
+        'task_completions_task_id_fkey', 'task_completions', 'tasks', ['task_id'], ['id']
+    )
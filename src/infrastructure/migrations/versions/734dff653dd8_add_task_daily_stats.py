@@ -0,0 +1,43 @@
+"""add task_daily_stats rollup
+
+Revision ID: 734dff653dd8
+Revises: 3227d5acfad9
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '734dff653dd8'
+down_revision: Union[str, None] = '3227d5acfad9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_daily_stats',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('time_spent', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id', 'day')
+    )
+
+    op.execute(
+        """
+        INSERT INTO task_daily_stats (task_id, day, time_spent)
+        SELECT task_id, date(end_time), SUM(COALESCE(duration, 0))
+        FROM timer_sessions
+        WHERE NOT active AND end_time IS NOT NULL AND task_id IS NOT NULL
+        GROUP BY task_id, date(end_time)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_daily_stats')
@@ -0,0 +1,153 @@
+"""store durations and tracked time in seconds
+
+Revision ID: 7d3c9e5a2f10
+Revises: 4f6b2d8e9a1c
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3c9e5a2f10'
+down_revision: Union[str, None] = '4f6b2d8e9a1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Each finished session's share of every local day its run segments touch.
+# A piece's share is the difference of floored cumulative fractions of the
+# duration, so the shares of a session add up to exactly its duration.
+SESSION_DAYS = """
+    WITH pieces AS (
+        SELECT timer_sessions.id, timer_sessions.user_id, timer_sessions.task_id,
+               COALESCE(timer_sessions.duration, 0) AS duration,
+               days.day::date AS day,
+               greatest(segments.run_start, timezone(users.timezone, days.day::timestamp)) AS piece_start,
+               extract(epoch FROM
+                   least(segments.run_end, timezone(users.timezone, (days.day + interval '1 day')::timestamp))
+                   - greatest(segments.run_start, timezone(users.timezone, days.day::timestamp))
+               ) AS seconds
+        FROM timer_sessions
+        JOIN users ON timer_sessions.user_id = users.id
+        CROSS JOIN LATERAL (
+            SELECT timer_sessions.start_time + timer_sessions.segments[i] * interval '1 second' AS run_start,
+                   timer_sessions.start_time + timer_sessions.segments[i + 1] * interval '1 second' AS run_end
+            FROM generate_series(1, array_length(timer_sessions.segments, 1) - 1, 2) AS i
+        ) AS segments
+        CROSS JOIN LATERAL generate_series(
+            date(timezone(users.timezone, segments.run_start)),
+            date(timezone(users.timezone, segments.run_end)),
+            interval '1 day'
+        ) AS days(day)
+        WHERE NOT timer_sessions.active
+          AND timer_sessions.start_time IS NOT NULL AND timer_sessions.end_time IS NOT NULL
+    ),
+    running AS (
+        SELECT *,
+               sum(seconds) OVER (PARTITION BY id) AS total_seconds,
+               sum(seconds) OVER (PARTITION BY id ORDER BY piece_start ROWS UNBOUNDED PRECEDING) AS through_seconds
+        FROM pieces
+    ),
+    session_days AS (
+        SELECT user_id, task_id, day,
+               COALESCE(
+                   floor(duration * through_seconds / nullif(total_seconds, 0))
+                   - floor(duration * (through_seconds - seconds) / nullif(total_seconds, 0)),
+                   0
+               )::integer AS time_spent
+        FROM running
+    )
+"""
+
+
+def upgrade() -> None:
+    # elapsed already holds exact seconds for every finished session
+    op.execute("UPDATE timer_sessions SET duration = elapsed WHERE active = false")
+    op.execute(
+        """
+        UPDATE tasks
+        SET actual_time_spent = coalesce((
+            SELECT sum(duration)
+            FROM timer_sessions
+            WHERE timer_sessions.task_id = tasks.id AND timer_sessions.active = false
+        ), 0)
+        """
+    )
+    # Rebase completions on the same exact durations: each one gets the sessions
+    # that ended after the task's previous completion and by this one, so they
+    # never add up to more than tasks.actual_time_spent and the next
+    # completion's delta (counter minus recorded completions) stays exact
+    op.execute(
+        """
+        UPDATE task_completions
+        SET actual_time_spent = coalesce((
+            SELECT sum(timer_sessions.duration)
+            FROM timer_sessions
+            WHERE timer_sessions.task_id = task_completions.task_id
+              AND timer_sessions.active = false
+              AND timer_sessions.end_time <= task_completions.completed_at
+              AND (previous.completed_at IS NULL OR timer_sessions.end_time > previous.completed_at)
+        ), 0)
+        FROM (
+            SELECT id, lag(completed_at) OVER (PARTITION BY task_id ORDER BY completed_at, id) AS completed_at
+            FROM task_completions
+        ) AS previous
+        WHERE previous.id = task_completions.id
+        """
+    )
+
+    # Recompute both rollups from the exact durations, the way
+    # DailyStatsRepository.rebuild() does: days are local to each user's time
+    # zone, and every run segment is split at local midnights with the
+    # session's duration shared out over the pieces. This also replaces the
+    # server-time date(end_time) buckets of the earlier backfills.
+    op.execute("DELETE FROM task_daily_stats")
+    op.execute("DELETE FROM user_daily_stats")
+    op.execute(
+        SESSION_DAYS + """
+        INSERT INTO task_daily_stats (task_id, day, time_spent)
+        SELECT task_id, day, SUM(time_spent)::integer
+        FROM session_days
+        WHERE task_id IS NOT NULL
+        GROUP BY task_id, day
+        """
+    )
+    op.execute(
+        SESSION_DAYS + """
+        INSERT INTO user_daily_stats
+            (user_id, day, time_spent, created_tasks, active_tasks, completed_tasks, planned_time)
+        SELECT user_id, day, SUM(time_spent)::integer, SUM(created_tasks)::integer, SUM(active_tasks)::integer,
+               SUM(completed_tasks)::integer, SUM(planned_time)::integer
+        FROM (
+            SELECT tasks.user_id, date(timezone(users.timezone, tasks.created_at)) AS day, 0 AS time_spent,
+                   1 AS created_tasks, CASE WHEN tasks.completed THEN 0 ELSE 1 END AS active_tasks,
+                   0 AS completed_tasks, 0 AS planned_time
+            FROM tasks JOIN users ON tasks.user_id = users.id
+            WHERE tasks.created_at IS NOT NULL
+            UNION ALL
+            SELECT tasks.user_id, date(timezone(users.timezone, tasks.completed_at)), 0, 0, 0, 1,
+                   COALESCE(tasks.estimated_time, 0) * 60
+            FROM tasks JOIN users ON tasks.user_id = users.id
+            WHERE tasks.completed AND tasks.completed_at IS NOT NULL
+            UNION ALL
+            SELECT user_id, day, time_spent, 0, 0, 0, 0
+            FROM session_days
+        ) AS contributions
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, day
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE task_daily_stats SET time_spent = round(time_spent / 60.0)")
+    op.execute(
+        "UPDATE user_daily_stats SET time_spent = round(time_spent / 60.0), planned_time = round(planned_time / 60.0)"
+    )
+    op.execute("UPDATE task_completions SET actual_time_spent = round(actual_time_spent / 60.0)")
+    op.execute("UPDATE tasks SET actual_time_spent = round(actual_time_spent / 60.0)")
+    op.execute("UPDATE timer_sessions SET duration = round(duration / 60.0) WHERE duration IS NOT NULL")
@@ -0,0 +1,30 @@
+"""add users.timezone
+
+Revision ID: 9b41c2e7d0a3
+Revises: 734dff653dd8
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b41c2e7d0a3'
+down_revision: Union[str, None] = '734dff653dd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing users keep UTC, which is what the rollup was bucketed in so far
+    op.add_column(
+        'users',
+        sa.Column('timezone', sa.String(), nullable=False, server_default='UTC')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'timezone')
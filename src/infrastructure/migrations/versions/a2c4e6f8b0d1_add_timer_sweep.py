@@ -0,0 +1,31 @@
+"""add users.max_timer_duration and active timer age index
+
+Revision ID: a2c4e6f8b0d1
+Revises: 7d3c9e5a2f10
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c4e6f8b0d1'
+down_revision: Union[str, None] = '7d3c9e5a2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('max_timer_duration', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_timer_sessions_start_time_active', 'timer_sessions', ['start_time'],
+        postgresql_where=sa.text('active = true')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timer_sessions_start_time_active', table_name='timer_sessions')
+    op.drop_column('users', 'max_timer_duration')
@@ -0,0 +1,28 @@
+"""replace tasks (user_id, created_at) index with (user_id, created_at, id) for keyset pagination
+
+Revision ID: b3d5f7a9c1e2
+Revises: a2c4e6f8b0d1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e2'
+down_revision: Union[str, None] = 'a2c4e6f8b0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_user_id_created_at_id', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_tasks_user_id_created_at', table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at'], unique=False)
+    op.drop_index('ix_tasks_user_id_created_at_id', table_name='tasks')
@@ -0,0 +1,39 @@
+"""add tasks.search_vector full-text column with GIN index
+
+Revision ID: c4e6a8b0d2f3
+Revises: b3d5f7a9c1e2
+Create Date: 2026-10-18 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e6a8b0d2f3'
+down_revision: Union[str, None] = 'b3d5f7a9c1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A stored generated column: Postgres fills it for existing rows and keeps it current
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
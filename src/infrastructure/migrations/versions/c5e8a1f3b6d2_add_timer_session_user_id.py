@@ -0,0 +1,57 @@
+"""add timer_sessions.user_id and one-active-timer index
+
+Revision ID: c5e8a1f3b6d2
+Revises: 9b41c2e7d0a3
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8a1f3b6d2'
+down_revision: Union[str, None] = '9b41c2e7d0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('timer_sessions', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'timer_sessions_user_id_fkey', 'timer_sessions', 'users', ['user_id'], ['id']
+    )
+    op.execute(
+        """
+        UPDATE timer_sessions
+        SET user_id = tasks.user_id
+        FROM tasks
+        WHERE tasks.id = timer_sessions.task_id
+        """
+    )
+
+    # Concurrent starts could leave several active timers per user; keep the
+    # newest and close the others as empty sessions so the index can be built
+    op.execute(
+        """
+        UPDATE timer_sessions
+        SET active = false, end_time = start_time, duration = 0
+        WHERE active
+          AND id NOT IN (
+              SELECT max(id) FROM timer_sessions WHERE active GROUP BY user_id
+          )
+        """
+    )
+    op.create_index(
+        'ix_timer_sessions_user_id_active', 'timer_sessions', ['user_id'],
+        unique=True,
+        postgresql_where=sa.text('active = true')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timer_sessions_user_id_active', table_name='timer_sessions')
+    op.drop_constraint('timer_sessions_user_id_fkey', 'timer_sessions', type_='foreignkey')
+    op.drop_column('timer_sessions', 'user_id')
@@ -0,0 +1,26 @@
+"""add task_tags (tag_id, task_id) index for tag filters
+
+Revision ID: d5f7b9c1e3a4
+Revises: c4e6a8b0d2f3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f7b9c1e3a4'
+down_revision: Union[str, None] = 'c4e6a8b0d2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_tags_tag_id_task_id', 'task_tags', ['tag_id', 'task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_tags_tag_id_task_id', table_name='task_tags')
@@ -0,0 +1,50 @@
+"""add pause/resume segments to timer_sessions
+
+Revision ID: e1a7d4c9f2b8
+Revises: c5e8a1f3b6d2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7d4c9f2b8'
+down_revision: Union[str, None] = 'c5e8a1f3b6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'timer_sessions',
+        sa.Column('paused', sa.Boolean(), nullable=False, server_default=sa.text('false'))
+    )
+    op.add_column(
+        'timer_sessions',
+        sa.Column('segments', postgresql.ARRAY(sa.Integer()), nullable=False, server_default=sa.text("'{0}'"))
+    )
+    op.add_column(
+        'timer_sessions',
+        sa.Column('elapsed', sa.Integer(), nullable=False, server_default=sa.text('0'))
+    )
+
+    # Existing finished sessions ran as one uninterrupted segment
+    op.execute(
+        """
+        UPDATE timer_sessions
+        SET segments = ARRAY[0, round(extract(epoch FROM end_time - start_time))::integer],
+            elapsed = round(extract(epoch FROM end_time - start_time))::integer
+        WHERE end_time IS NOT NULL AND start_time IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('timer_sessions', 'elapsed')
+    op.drop_column('timer_sessions', 'segments')
+    op.drop_column('timer_sessions', 'paused')
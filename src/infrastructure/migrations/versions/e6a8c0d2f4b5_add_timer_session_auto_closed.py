@@ -0,0 +1,33 @@
+"""add timer_sessions.auto_closed for reporting swept timers
+
+Revision ID: e6a8c0d2f4b5
+Revises: d5f7b9c1e3a4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a8c0d2f4b5'
+down_revision: Union[str, None] = 'd5f7b9c1e3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('timer_sessions', sa.Column('auto_closed', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('timer_sessions', sa.Column('auto_close_reported', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.create_index(
+        'ix_timer_sessions_user_id_auto_closed', 'timer_sessions', ['user_id'],
+        postgresql_where=sa.text('auto_closed = true AND auto_close_reported = false')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timer_sessions_user_id_auto_closed', table_name='timer_sessions')
+    op.drop_column('timer_sessions', 'auto_close_reported')
+    op.drop_column('timer_sessions', 'auto_closed')
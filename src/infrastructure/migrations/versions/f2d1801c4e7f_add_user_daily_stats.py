@@ -0,0 +1,64 @@
+"""add user_daily_stats rollup
+
+Revision ID: f2d1801c4e7f
+Revises: 33202c4e12c9
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d1801c4e7f'
+down_revision: Union[str, None] = '33202c4e12c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_daily_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('time_spent', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('planned_time', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill from existing data; `python rebuild_stats.py` does the same at runtime
+    op.execute(
+        """
+        INSERT INTO user_daily_stats
+            (user_id, day, time_spent, created_tasks, active_tasks, completed_tasks, planned_time)
+        SELECT user_id, day, SUM(time_spent), SUM(created_tasks), SUM(active_tasks),
+               SUM(completed_tasks), SUM(planned_time)
+        FROM (
+            SELECT user_id, date(created_at) AS day, 0 AS time_spent, 1 AS created_tasks,
+                   CASE WHEN completed THEN 0 ELSE 1 END AS active_tasks,
+                   0 AS completed_tasks, 0 AS planned_time
+            FROM tasks
+            WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT user_id, date(completed_at), 0, 0, 0, 1, COALESCE(estimated_time, 0)
+            FROM tasks
+            WHERE completed AND completed_at IS NOT NULL
+            UNION ALL
+            SELECT tasks.user_id, date(timer_sessions.end_time), COALESCE(timer_sessions.duration, 0), 0, 0, 0, 0
+            FROM timer_sessions JOIN tasks ON timer_sessions.task_id = tasks.id
+            WHERE NOT timer_sessions.active AND timer_sessions.end_time IS NOT NULL
+        ) AS contributions
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id, day
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_daily_stats')
@@ -0,0 +1,29 @@
+"""add timer_sessions (user_id, end_time) index for finished sessions
+
+Revision ID: f7b9d1e3a5c6
+Revises: e6a8c0d2f4b5
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b9d1e3a5c6'
+down_revision: Union[str, None] = 'e6a8c0d2f4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_timer_sessions_user_id_end_time', 'timer_sessions', ['user_id', 'end_time'],
+        postgresql_where=sa.text('active = false')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timer_sessions_user_id_end_time', table_name='timer_sessions')
@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from .api.endpoints import tasks, tags, timer, statistics, users
 from .core.config import settings
+from .core.database import engine, AsyncSessionFactory
+from .infrastructure.cache.notifications import cache_notifications
+from .domain.services.timer_sweeper import TimerSweeper
 
 
 def create_app():
@@ -16,6 +19,18 @@ def create_app():
     app.include_router(tags.router)
     app.include_router(timer.router)
     app.include_router(statistics.router)
+
+    timer_sweeper = TimerSweeper(AsyncSessionFactory)
+
+    @app.on_event("startup")
+    async def start_background_tasks():
+        cache_notifications.start(engine)
+        timer_sweeper.start()
+
+    @app.on_event("shutdown")
+    async def stop_background_tasks():
+        await timer_sweeper.stop()
+        await cache_notifications.stop()
     
     @app.get("/")
     async def root():
@@ -1,6 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from ..core.config import settings
+
+
+def validate_timezone(value: Optional[str]) -> Optional[str]:
+    """Accept only IANA time zone names such as 'Europe/Moscow'"""
+    if value is None:
+        return value
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {value}")
+    return value
 
 
 class UserBase(BaseModel):
@@ -9,11 +22,30 @@ class UserBase(BaseModel):
 
 
 class UserCreate(UserBase):
-    pass
+    timezone: Optional[str] = None
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: Optional[str]) -> Optional[str]:
+        return validate_timezone(value)
+
+
+class UserUpdate(BaseModel):
+    username: Optional[str] = None
+    timezone: Optional[str] = None
+    # Seconds after which a forgotten timer is closed automatically
+    max_timer_duration: Optional[int] = Field(None, ge=settings.min_max_timer_duration)
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: Optional[str]) -> Optional[str]:
+        return validate_timezone(value)
 
 
 class UserResponse(UserBase):
     id: int
+    timezone: str = "UTC"
+    max_timer_duration: Optional[int] = None
     created_at: datetime
 
     class Config: